@@ -4,6 +4,7 @@ Setup script for MCP Data Analysis Toolkit
 Provides easy commands to run servers, tests, and demos.
 """
 
+import asyncio
 import subprocess
 import sys
 import os
@@ -13,11 +14,14 @@ from pathlib import Path
 PROJECT_ROOT = Path(__file__).parent
 os.chdir(PROJECT_ROOT)
 
+# Section separator for command output
+SEP = "=" * 60
+
 def run_command(cmd, description):
     """Run a command with description."""
-    print(f"\n{'='*60}")
+    print(f"\n{SEP}")
     print(f">> {description}")
-    print(f"{'='*60}")
+    print(SEP)
     print(f"Command: {' '.join(cmd)}")
     print()
     
@@ -32,6 +36,57 @@ def run_command(cmd, description):
         print(f"- Command not found: {cmd[0]}")
         return False
 
+async def run_command_async(cmd, description):
+    """Run a command with description without blocking the event loop."""
+    print(f"\n{SEP}")
+    print(f">> {description}")
+    print(SEP)
+    print(f"Command: {' '.join(cmd)}")
+    print()
+    
+    try:
+        process = await asyncio.create_subprocess_exec(*cmd)
+        returncode = await process.wait()
+    except FileNotFoundError:
+        print(f"- Command not found: {cmd[0]}")
+        return False
+    
+    if returncode == 0:
+        print(f"+ {description} completed successfully!")
+        return True
+    print(f"- {description} failed with error code: {returncode}")
+    return False
+
+async def run_client_async(description, mode):
+    """Run the example client in this process on the current event loop."""
+    print(f"\n{SEP}")
+    print(f">> {description}")
+    print(SEP)
+    print(f"Client mode: {mode}")
+    print()
+    
+    # Imported here so commands that don't use the client stay fast
+    from src.clients.client_example import main as client_main
+    
+    try:
+        await client_main(mode)
+    except Exception as e:
+        print(f"- {description} failed: {e}")
+        return False
+    print(f"+ {description} completed successfully!")
+    return True
+
+def run_client(description, mode):
+    """Run the example client in this process."""
+    return asyncio.run(run_client_async(description, mode))
+
+async def run_all():
+    """Run the client demo and the test suite together on one event loop."""
+    return await asyncio.gather(
+        run_client_async("Demo", "all"),
+        run_command_async([sys.executable, "tests/test_mcp.py"], "Tests")
+    )
+
 def main():
     """Main setup function."""
     print("MCP Data Analysis Toolkit Setup")
@@ -69,7 +124,7 @@ Available commands:
         run_command([sys.executable, "tests/test_mcp.py"], "Running Test Suite")
     
     elif command == "demo":
-        run_command([sys.executable, "src/clients/client_example.py"], "Running Client Demo")
+        run_client("Running Client Demo", "all")
     
     elif command == "basic":
         run_command([sys.executable, "src/mcp_servers/basic_server.py"], "Starting Basic MCP Server")
@@ -81,15 +136,14 @@ Available commands:
         run_command([sys.executable, "src/mcp_servers/data_analysis_server.py"], "Starting Data Analysis Server")
     
     elif command == "client":
-        run_command([sys.executable, "src/clients/client_example.py"], "Running Client Examples")
+        run_client("Running Client Examples", "all")
     
     elif command == "interactive":
-        run_command([sys.executable, "src/clients/client_example.py", "interactive"], "Starting Interactive Client")
+        run_client("Starting Interactive Client", "interactive")
     
     elif command == "all":
         print("Running complete demonstration...")
-        run_command([sys.executable, "src/clients/client_example.py"], "Demo")
-        run_command([sys.executable, "tests/test_mcp.py"], "Tests")
+        asyncio.run(run_all())
     
     elif command == "help":
         # Show usage message directly
@@ -23,12 +23,34 @@ __author__ = "Vijay Andem"
 __email__ = "your.email@example.com"
 __description__ = "MCP Data Analysis Toolkit for AI-powered business intelligence"
 
-from .mcp_servers import *
-from .clients import *
-
 __all__ = [
     "BasicMCPServer",
     "AdvancedMCPServer", 
     "DataAnalysisMCPServer",
     "MCPClientExample"
-]
\ No newline at end of file
+]
+
+# Exported classes are imported on first access (PEP 562) so that
+# ``import src`` or ``from src import __version__`` does not pull in
+# pandas, numpy and mcp.
+_LAZY_EXPORTS = {
+    "BasicMCPServer": ".mcp_servers.basic_server",
+    "AdvancedMCPServer": ".mcp_servers.advanced_server",
+    "DataAnalysisMCPServer": ".mcp_servers.data_analysis_server",
+    "MCPClientExample": ".clients.client_example",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
\ No newline at end of file
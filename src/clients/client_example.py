@@ -7,72 +7,163 @@ and interacts with their tools, resources, and prompts.
 """
 
 import asyncio
+import base64
+import gzip
 import json
 import subprocess
 import sys
-from typing import Any, Dict, List, Optional
+from contextlib import AsyncExitStack
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import mcp.client.stdio
-import mcp.types as types
-from mcp.client.session import ClientSession
+if TYPE_CHECKING:
+    # The mcp package pulls in anyio and pydantic; it is imported lazily in
+    # connect_to_server so importing this module stays cheap.
+    import mcp.types as types
+    from mcp.client.session import ClientSession
+
+# Buffer size for the server's stdio pipes
+PIPE_BUFFER_SIZE = 8192
+
+def resource_text(contents: Any) -> str:
+    """Text of one resource contents item, decoding binary (blob) resources.
+
+    The server base64-encodes bytes (URL-safe alphabet in mcp 1.0); gzip
+    payloads such as data://analysis_guide.gz are decompressed as well.
+    """
+    blob = getattr(contents, "blob", None)
+    if blob is None:
+        return contents.text
+    data = base64.urlsafe_b64decode(blob)
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return data.decode("utf-8", errors="replace")
+
+
+# Section separator for demo output
+SEP = "=" * 60
+
+# Static menus for the interactive session, written in one call each
+_SERVER_MENU = (
+    "Available servers:\n"
+    "1. Basic Server (basic tools and utilities)\n"
+    "2. Data Analysis Server (data analysis tools)\n"
+    "3. Exit\n"
+)
+
+_SESSION_MENU = (
+    "\nCommands:\n"
+    "1. List tools\n"
+    "2. Call tool\n"
+    "3. List resources\n"
+    "4. Read resource\n"
+    "5. List prompts\n"
+    "6. Back to server selection\n"
+)
 
 
 class MCPClientExample:
     """Example MCP client for interacting with MCP servers."""
     
     def __init__(self):
-        self.session: Optional[ClientSession] = None
+        self.session: Optional["ClientSession"] = None
         self.server_process: Optional[subprocess.Popen] = None
+        # Live connections keyed by server command, reused across demos
+        self._sessions: Dict[Tuple[str, ...], Tuple[subprocess.Popen, "ClientSession"]] = {}
+        self._exit_stacks: Dict[Tuple[str, ...], AsyncExitStack] = {}
+        self._current_key: Optional[Tuple[str, ...]] = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close_all()
     
     async def connect_to_server(self, server_command: List[str]) -> bool:
-        """Connect to an MCP server using stdio transport."""
+        """Connect to an MCP server using stdio transport.
+        
+        Connections are cached per server command, so connecting to the same
+        server again reuses the running process and session.
+        """
+        key = tuple(server_command)
+        if key in self._sessions:
+            self.server_process, self.session = self._sessions[key]
+            self._current_key = key
+            return True
+        
+        import mcp.client.stdio
+        from mcp.client.session import ClientSession
+        
+        exit_stack = AsyncExitStack()
         try:
             print(f"Starting server: {' '.join(server_command)}")
             
-            # Start the server process
-            self.server_process = subprocess.Popen(
+            # Start the server process with fully buffered pipes so each
+            # JSON-RPC message is not split across many small reads/writes
+            server_process = subprocess.Popen(
                 server_command,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                bufsize=PIPE_BUFFER_SIZE
             )
+            exit_stack.callback(server_process.wait)
+            exit_stack.callback(server_process.terminate)
             
             # Create stdio connection
-            async with mcp.client.stdio.stdio_client(
-                self.server_process.stdout, 
-                self.server_process.stdin
-            ) as (read_stream, write_stream):
-                
-                # Initialize client session
-                self.session = ClientSession(read_stream, write_stream)
-                
-                # Initialize the connection
-                init_result = await self.session.initialize()
-                print(f"Connected to server: {init_result.server_info.name}")
-                print(f"Server version: {init_result.server_info.version}")
-                
-                return True
+            read_stream, write_stream = await exit_stack.enter_async_context(
+                mcp.client.stdio.stdio_client(
+                    server_process.stdout, 
+                    server_process.stdin
+                )
+            )
+            
+            # Initialize client session
+            session = await exit_stack.enter_async_context(
+                ClientSession(read_stream, write_stream)
+            )
+            
+            # Initialize the connection
+            init_result = await session.initialize()
+            print(f"Connected to server: {init_result.server_info.name}")
+            print(f"Server version: {init_result.server_info.version}")
             
         except Exception as e:
             print(f"Failed to connect to server: {e}")
-            await self.disconnect()
+            await exit_stack.aclose()
             return False
+        
+        self._sessions[key] = (server_process, session)
+        self._exit_stacks[key] = exit_stack
+        self.server_process, self.session = server_process, session
+        self._current_key = key
+        return True
     
     async def disconnect(self):
-        """Disconnect from the server."""
-        if self.session:
-            await self.session.close()
-            self.session = None
-        
-        if self.server_process:
-            self.server_process.terminate()
-            self.server_process.wait()
-            self.server_process = None
+        """Disconnect from the current server and shut it down."""
+        if self._current_key is not None:
+            self._sessions.pop(self._current_key, None)
+            exit_stack = self._exit_stacks.pop(self._current_key, None)
+            if exit_stack:
+                await exit_stack.aclose()
         
+        self.session = None
+        self.server_process = None
+        self._current_key = None
         print("Disconnected from server")
     
-    async def list_tools(self) -> List[types.Tool]:
+    async def close_all(self):
+        """Shut down every cached server connection."""
+        # Close in reverse order of creation so nested task scopes unwind cleanly
+        for key in reversed(list(self._exit_stacks)):
+            await self._exit_stacks.pop(key).aclose()
+        
+        self._sessions.clear()
+        self.session = None
+        self.server_process = None
+        self._current_key = None
+    
+    async def list_tools(self) -> List["types.Tool"]:
         """List available tools from the server."""
         if not self.session:
             raise RuntimeError("Not connected to server")
@@ -88,7 +179,7 @@ class MCPClientExample:
         result = await self.session.call_tool(name, arguments)
         return result.content
     
-    async def list_resources(self) -> List[types.Resource]:
+    async def list_resources(self) -> List["types.Resource"]:
         """List available resources from the server."""
         if not self.session:
             raise RuntimeError("Not connected to server")
@@ -102,9 +193,9 @@ class MCPClientExample:
             raise RuntimeError("Not connected to server")
         
         result = await self.session.read_resource(uri)
-        return result.contents[0].text if result.contents else ""
+        return resource_text(result.contents[0]) if result.contents else ""
     
-    async def list_prompts(self) -> List[types.Prompt]:
+    async def list_prompts(self) -> List["types.Prompt"]:
         """List available prompts from the server."""
         if not self.session:
             raise RuntimeError("Not connected to server")
@@ -122,153 +213,158 @@ class MCPClientExample:
     
     async def demonstrate_basic_server(self):
         """Demonstrate interaction with the basic MCP server."""
-        print("\n" + "="*60)
+        print(f"\n{SEP}")
         print("DEMONSTRATING BASIC MCP SERVER")
-        print("="*60)
+        print(SEP)
         
         # Connect to basic server
         server_cmd = [sys.executable, "src/mcp_servers/basic_server.py"]
         if not await self.connect_to_server(server_cmd):
             return
         
-        try:
-            # List and test tools
-            print("\n📧 LISTING TOOLS:")
-            tools = await self.list_tools()
-            for tool in tools:
-                print(f"• {tool.name}: {tool.description}")
-            
-            print("\n🔧 TESTING TOOLS:")
-            
-            # Test calculator
-            print("\n1. Calculator Tool:")
-            result = await self.call_tool("calculator", {"expression": "10 + 5 * 2"})
-            print(f"   Result: {result[0].text}")
-            
-            # Test string utils
-            print("\n2. String Utils Tool:")
-            result = await self.call_tool("string_utils", {
+        # Issue the independent requests together; JSON-RPC ids let the
+        # session match each reply to its request
+        tools, calc_result, string_result, time_result, resources, prompts = await asyncio.gather(
+            self.list_tools(),
+            self.call_tool("calculator", {"expression": "10 + 5 * 2"}),
+            self.call_tool("string_utils", {
                 "text": "Hello MCP World", 
                 "operation": "uppercase"
-            })
-            print(f"   Result: {result[0].text}")
-            
-            # Test time tool
-            print("\n3. Current Time Tool:")
-            result = await self.call_tool("get_current_time", {"format": "readable"})
-            print(f"   Result: {result[0].text}")
-            
-            # List and read resources
-            print("\n📚 RESOURCES:")
-            resources = await self.list_resources()
-            for resource in resources:
-                print(f"\n• {resource.name}:")
-                content = await self.read_resource(str(resource.uri))
-                if resource.mimeType == "application/json":
-                    data = json.loads(content)
-                    print(f"   {json.dumps(data, indent=4)[:200]}...")
-                else:
-                    print(f"   {content[:200]}...")
-            
-            # List prompts
-            print("\n💬 PROMPTS:")
-            prompts = await self.list_prompts()
-            for prompt in prompts:
-                print(f"• {prompt.name}: {prompt.description}")
-            
-        finally:
-            await self.disconnect()
+            }),
+            self.call_tool("get_current_time", {"format": "readable"}),
+            self.list_resources(),
+            self.list_prompts()
+        )
+        
+        # List and test tools
+        print("\n📧 LISTING TOOLS:")
+        for tool in tools:
+            print(f"• {tool.name}: {tool.description}")
+        
+        print("\n🔧 TESTING TOOLS:")
+        
+        # Test calculator
+        print("\n1. Calculator Tool:")
+        print(f"   Result: {calc_result[0].text}")
+        
+        # Test string utils
+        print("\n2. String Utils Tool:")
+        print(f"   Result: {string_result[0].text}")
+        
+        # Test time tool
+        print("\n3. Current Time Tool:")
+        print(f"   Result: {time_result[0].text}")
+        
+        # List and read resources, fetching all contents in one batch
+        print("\n📚 RESOURCES:")
+        contents = await asyncio.gather(
+            *(self.read_resource(str(resource.uri)) for resource in resources)
+        )
+        for resource, content in zip(resources, contents):
+            print(f"\n• {resource.name}:")
+            if resource.mimeType == "application/json":
+                data = json.loads(content)
+                print(f"   {json.dumps(data, indent=4)[:200]}...")
+            else:
+                print(f"   {content[:200]}...")
+        
+        # List prompts
+        print("\n💬 PROMPTS:")
+        for prompt in prompts:
+            print(f"• {prompt.name}: {prompt.description}")
     
     async def demonstrate_data_analysis_server(self):
         """Demonstrate interaction with the data analysis server."""
-        print("\n" + "="*60)
+        print(f"\n{SEP}")
         print("DEMONSTRATING DATA ANALYSIS SERVER")
-        print("="*60)
+        print(SEP)
         
         # Connect to data analysis server
         server_cmd = [sys.executable, "src/mcp_servers/data_analysis_server.py"]
         if not await self.connect_to_server(server_cmd):
             return
         
-        try:
-            # List tools
-            print("\n📊 DATA ANALYSIS TOOLS:")
-            tools = await self.list_tools()
-            for tool in tools:
-                print(f"• {tool.name}: {tool.description}")
-            
-            print("\n🔍 TESTING DATA ANALYSIS:")
-            
-            # Load sample dataset
-            print("\n1. Loading Sample Dataset:")
-            result = await self.call_tool("load_dataset", {
+        # Listing tools and loading the dataset are independent
+        tools, load_result = await asyncio.gather(
+            self.list_tools(),
+            self.call_tool("load_dataset", {
                 "path": "data/sample_data.csv",
                 "name": "employees"
             })
-            print(f"   {result[0].text}")
-            
-            # Get dataset info
-            print("\n2. Dataset Information:")
-            result = await self.call_tool("dataset_info", {"name": "employees"})
-            data = json.loads(result[0].text.split("Dataset Information:\n")[1])
-            print(f"   Shape: {data['shape']}")
-            print(f"   Columns: {data['columns']['names']}")
-            
-            # Calculate statistics
-            print("\n3. Statistical Analysis:")
-            result = await self.call_tool("calculate_statistics", {"name": "employees"})
-            stats_lines = result[0].text.split('\n')[:10]  # Show first 10 lines
-            print("   " + "\n   ".join(stats_lines))
-            
-            # Find correlations
-            print("\n4. Correlation Analysis:")
-            result = await self.call_tool("find_correlations", {
+        )
+        
+        # Every analysis below only reads the loaded dataset, so run them together
+        (info_result, stats_result, corr_result, group_result,
+         quality_result, insights_result) = await asyncio.gather(
+            self.call_tool("dataset_info", {"name": "employees"}),
+            self.call_tool("calculate_statistics", {"name": "employees"}),
+            self.call_tool("find_correlations", {
                 "name": "employees",
                 "threshold": 0.3
-            })
-            corr_lines = result[0].text.split('\n')[:15]  # Show first 15 lines
-            print("   " + "\n   ".join(corr_lines))
-            
-            # Group analysis
-            print("\n5. Group Analysis by Department:")
-            result = await self.call_tool("group_analysis", {
+            }),
+            self.call_tool("group_analysis", {
                 "name": "employees",
                 "group_by": "department",
                 "agg_columns": ["salary", "age"],
                 "operations": ["mean", "count"]
-            })
-            group_lines = result[0].text.split('\n')[:10]  # Show first 10 lines
-            print("   " + "\n   ".join(group_lines))
-            
-            # Data quality check
-            print("\n6. Data Quality Assessment:")
-            result = await self.call_tool("data_quality_check", {"name": "employees"})
-            quality_data = json.loads(result[0].text.split("Data Quality Report:\n")[1])
-            print(f"   Total rows: {quality_data['total_rows']}")
-            print(f"   Missing values: {quality_data['missing_data']['total_missing_values']}")
-            print(f"   Duplicate rows: {quality_data['duplicates']['duplicate_rows']}")
-            
-            # Generate insights
-            print("\n7. Automated Insights:")
-            result = await self.call_tool("generate_insights", {
+            }),
+            self.call_tool("data_quality_check", {"name": "employees"}),
+            self.call_tool("generate_insights", {
                 "name": "employees",
                 "focus": "recommendations"
             })
-            insights_lines = result[0].text.split('\n')[:15]  # Show first 15 lines
-            print("   " + "\n   ".join(insights_lines))
-            
-        finally:
-            await self.disconnect()
+        )
+        
+        # List tools
+        print("\n📊 DATA ANALYSIS TOOLS:")
+        for tool in tools:
+            print(f"• {tool.name}: {tool.description}")
+        
+        print("\n🔍 TESTING DATA ANALYSIS:")
+        
+        # Load sample dataset
+        print("\n1. Loading Sample Dataset:")
+        print(f"   {load_result[0].text}")
+        
+        # Get dataset info
+        print("\n2. Dataset Information:")
+        data = json.loads(info_result[0].text.partition("Dataset Information:\n")[2])
+        print(f"   Shape: {data['shape']}")
+        print(f"   Columns: {data['columns']['names']}")
+        
+        # Calculate statistics
+        print("\n3. Statistical Analysis:")
+        stats_lines = stats_result[0].text.split('\n')[:10]  # Show first 10 lines
+        print("   " + "\n   ".join(stats_lines))
+        
+        # Find correlations
+        print("\n4. Correlation Analysis:")
+        corr_lines = corr_result[0].text.split('\n')[:15]  # Show first 15 lines
+        print("   " + "\n   ".join(corr_lines))
+        
+        # Group analysis
+        print("\n5. Group Analysis by Department:")
+        group_lines = group_result[0].text.split('\n')[:10]  # Show first 10 lines
+        print("   " + "\n   ".join(group_lines))
+        
+        # Data quality check
+        print("\n6. Data Quality Assessment:")
+        quality_data = json.loads(quality_result[0].text.partition("Data Quality Report:\n")[2])
+        print(f"   Total rows: {quality_data['total_rows']}")
+        print(f"   Missing values: {quality_data['missing_data']['total_missing_values']}")
+        print(f"   Duplicate rows: {quality_data['duplicates']['duplicate_rows']}")
+        
+        # Generate insights
+        print("\n7. Automated Insights:")
+        insights_lines = insights_result[0].text.split('\n')[:15]  # Show first 15 lines
+        print("   " + "\n   ".join(insights_lines))
     
     async def demonstrate_interactive_session(self):
         """Run an interactive session with user input."""
-        print("\n" + "="*60)
+        print(f"\n{SEP}")
         print("INTERACTIVE MCP CLIENT SESSION")
-        print("="*60)
-        print("Available servers:")
-        print("1. Basic Server (basic tools and utilities)")
-        print("2. Data Analysis Server (data analysis tools)")
-        print("3. Exit")
+        print(SEP)
+        sys.stdout.write(_SERVER_MENU)
         
         while True:
             try:
@@ -291,11 +387,9 @@ class MCPClientExample:
                     continue
                 
                 await self.interactive_session_loop()
-                await self.disconnect()
                 
             except KeyboardInterrupt:
                 print("\nSession interrupted by user.")
-                await self.disconnect()
                 break
             except Exception as e:
                 print(f"Error in interactive session: {e}")
@@ -304,13 +398,7 @@ class MCPClientExample:
     async def interactive_session_loop(self):
         """Main loop for interactive session."""
         while True:
-            print("\nCommands:")
-            print("1. List tools")
-            print("2. Call tool")
-            print("3. List resources")
-            print("4. Read resource")
-            print("5. List prompts")
-            print("6. Back to server selection")
+            sys.stdout.write(_SESSION_MENU)
             
             try:
                 cmd = input("\nEnter command (1-6): ").strip()
@@ -380,33 +468,41 @@ class MCPClientExample:
                 break
 
 
-async def main():
-    """Main function to run the client examples."""
+async def main(mode: Optional[str] = None):
+    """Main function to run the client examples.
+    
+    ``mode`` is one of "basic", "data", "interactive" or "all"; when omitted
+    it is read from the command line and defaults to "all".
+    """
+    if mode is None:
+        mode = sys.argv[1] if len(sys.argv) > 1 else "all"
+    
     client = MCPClientExample()
     
     print("MCP Client Example")
     print("This client demonstrates connecting to and interacting with MCP servers.")
     
-    if len(sys.argv) > 1:
-        mode = sys.argv[1]
+    try:
         if mode == "basic":
             await client.demonstrate_basic_server()
         elif mode == "data":
             await client.demonstrate_data_analysis_server()
         elif mode == "interactive":
             await client.demonstrate_interactive_session()
+        elif mode == "all":
+            print("\nRunning all demonstrations...")
+            await client.demonstrate_basic_server()
+            await client.demonstrate_data_analysis_server()
+            
+            print(f"\n{SEP}")
+            print("DEMONSTRATIONS COMPLETE")
+            print(SEP)
+            print("\nTo run interactive mode:")
+            print("python src/clients/client_example.py interactive")
         else:
             print(f"Unknown mode: {mode}")
-    else:
-        print("\nRunning all demonstrations...")
-        await client.demonstrate_basic_server()
-        await client.demonstrate_data_analysis_server()
-        
-        print("\n" + "="*60)
-        print("DEMONSTRATIONS COMPLETE")
-        print("="*60)
-        print("\nTo run interactive mode:")
-        print("python src/clients/client_example.py interactive")
+    finally:
+        await client.close_all()
 
 
 # Export the class for importing
@@ -0,0 +1,60 @@
+"""
+JSON serialization shared by the MCP servers.
+
+Every server formats its JSON replies and resources through dumps(). Both
+encoders convert values through the same rules, so clients decode the same
+types and values whichever encoder is installed: numpy scalars and arrays
+become plain numbers and lists, NaN and infinities become null, dates and
+times become ISO 8601 strings, and anything else falls back to str().
+"""
+
+import json
+import math
+import sys
+from datetime import date, time
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _finite(obj: Any) -> Any:
+    """Replace NaN and infinities, which orjson writes as null, with None."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def _default(obj: Any) -> Any:
+    """Convert a value neither encoder handles natively."""
+    # numpy objects can only exist once something else has imported numpy
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if isinstance(obj, np.datetime64):
+            return obj.astype("datetime64[us]").item()
+        if isinstance(obj, np.generic):
+            return _finite(obj.item())
+        if isinstance(obj, np.ndarray):
+            return _finite(obj.tolist())
+    # Subclasses such as pandas' Timestamp, which orjson does not format itself
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize obj as indented JSON, via orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(_finite(obj), indent=2, default=_default, ensure_ascii=False)
@@ -11,13 +11,15 @@ Demonstrates advanced MCP features including:
 
 import asyncio
 import csv
-import json
+import math
 import os
 import sys
 import tempfile
+import warnings
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import mcp.server.stdio
 import mcp.types as types
@@ -25,11 +27,584 @@ from mcp.server import NotificationOptions, Server
 from pydantic import AnyUrl
 
 try:
+    from ._serialization import dumps as _dumps
+except ImportError:
+    # Run as a script: this directory is on sys.path instead of the package
+    from _serialization import dumps as _dumps
+
+try:
+    import numpy as np
     import pandas as pd
     PANDAS_AVAILABLE = True
 except ImportError:
     PANDAS_AVAILABLE = False
 
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Tool and resource listings never change, so they are built once at import
+# instead of on every list_* request.
+_FILE_TOOLS = (
+    types.Tool(
+        name="file_read",
+        description="Read contents of a file",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "File path to read"},
+                "encoding": {"type": "string", "default": "utf-8", "description": "File encoding"},
+                "max_chars": {"type": "integer", "minimum": 1, "description": "Read at most this many characters"}
+            },
+            "required": ["path"]
+        }
+    ),
+    types.Tool(
+        name="file_read_batch",
+        description="Read several files in one call",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "paths": {"type": "array", "items": {"type": "string"}, "description": "File paths to read"},
+                "encoding": {"type": "string", "default": "utf-8", "description": "File encoding"},
+                "max_chars": {"type": "integer", "minimum": 1, "description": "Read at most this many characters per file"}
+            },
+            "required": ["paths"]
+        }
+    ),
+    types.Tool(
+        name="file_write",
+        description="Write content to a file",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "File path to write"},
+                "content": {"type": "string", "description": "Content to write"},
+                "encoding": {"type": "string", "default": "utf-8"}
+            },
+            "required": ["path", "content"]
+        }
+    ),
+    types.Tool(
+        name="directory_list",
+        description="List directory contents",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "Directory path to list"},
+                "show_hidden": {"type": "boolean", "default": False}
+            },
+            "required": ["path"]
+        }
+    )
+)
+
+_PANDAS_TOOLS = (
+    types.Tool(
+        name="csv_analyze",
+        description="Analyze CSV file and provide statistics",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "CSV file path"},
+                "delimiter": {"type": "string", "default": ","}
+            },
+            "required": ["path"]
+        }
+    ),
+    types.Tool(
+        name="data_summary",
+        description="Generate summary statistics for dataset",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "path": {"type": "string", "description": "Data file path"},
+                "columns": {"type": "array", "items": {"type": "string"}, "description": "Specific columns to analyze"}
+            },
+            "required": ["path"]
+        }
+    )
+)
+
+_TOOLS = _FILE_TOOLS + (_PANDAS_TOOLS if PANDAS_AVAILABLE else ())
+
+_RESOURCES = (
+    types.Resource(
+        uri=AnyUrl("advanced://capabilities"),
+        name="Server Capabilities",
+        description="Advanced server features and capabilities",
+        mimeType="application/json"
+    ),
+    types.Resource(
+        uri=AnyUrl("advanced://temp_workspace"),
+        name="Temporary Workspace",
+        description="Information about temporary workspace",
+        mimeType="application/json"
+    )
+)
+
+
+def _read_text(path: str, encoding: str, max_chars: Optional[int] = None) -> str:
+    """Read a text file, up to max_chars characters (runs in the default executor)."""
+    with open(path, 'r', encoding=encoding) as f:
+        if hasattr(os, "posix_fadvise"):
+            # Ask for a larger readahead window; not available on Windows/macOS.
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass  # A hint only; pipes and some filesystems reject it (ESPIPE/EINVAL)
+        return f.read() if max_chars is None else f.read(max_chars)
+
+
+def _max_chars_argument(arguments: Dict[str, Any]) -> Optional[int]:
+    """Validated max_chars argument of the file_read tools, or None if absent."""
+    max_chars = arguments.get("max_chars")
+    if max_chars is not None and (isinstance(max_chars, bool) or not isinstance(max_chars, int) or max_chars < 1):
+        raise ValueError(f"max_chars must be a positive integer, got {max_chars!r}")
+    return max_chars
+
+
+def _file_read_reply(path: str, encoding: str, max_chars: Optional[int] = None) -> str:
+    """Read a file and format the file_read reply (runs in the default executor)."""
+    if not os.path.exists(path):
+        return f"File not found: {path}"
+    
+    # One character past the limit tells a cut file from one exactly max_chars long
+    content = _read_text(path, encoding, None if max_chars is None else max_chars + 1)
+    truncated = max_chars is not None and len(content) > max_chars
+    if truncated:
+        content = content[:max_chars]
+    
+    size = f"{len(content)} characters"
+    if truncated:
+        size += f" (limited by max_chars; file is {os.path.getsize(path)} bytes)"
+    
+    return f"File: {path}\nSize: {size}\n\nContent:\n{content}"
+
+
+def _write_text(path: str, content: str, encoding: str, known_dirs: Set[str]) -> None:
+    """Write a text file, creating parent directories (runs in the default executor).
+
+    Directories in known_dirs were already created by an earlier write and
+    are not checked again.
+    """
+    parent = os.path.dirname(path)
+    if parent and parent not in known_dirs:
+        os.makedirs(parent, exist_ok=True)
+        known_dirs.add(parent)
+    try:
+        f = open(path, 'w', encoding=encoding)
+    except FileNotFoundError:
+        if not parent:
+            raise
+        # The directory was removed since we last created it
+        known_dirs.discard(parent)
+        os.makedirs(parent, exist_ok=True)
+        known_dirs.add(parent)
+        f = open(path, 'w', encoding=encoding)
+    with f:
+        f.write(content)
+
+
+def _format_entry(entry: os.DirEntry) -> str:
+    """Format one directory_list line: type, size and name."""
+    if entry.is_dir():
+        return "%-4s %10s %s" % ("DIR", "-", entry.name)
+    size = entry.stat().st_size if entry.is_file() else "-"
+    return "%-4s %10s %s" % ("FILE", size, entry.name)
+
+
+# Strings pandas.read_csv treats as missing by default; the fast backends are
+# told to use the same set so their null counts match.
+_PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null"
+]
+
+
+# numpy dtype names for the fixed-width types the fast backends infer, keyed
+# by str() of a polars or Arrow type. Anything else (text, dates) is object.
+_BACKEND_DTYPE_NAMES = {
+    "Int8": "int8", "Int16": "int16", "Int32": "int32", "Int64": "int64",
+    "UInt8": "uint8", "UInt16": "uint16", "UInt32": "uint32", "UInt64": "uint64",
+    "Float32": "float32", "Float64": "float64", "Boolean": "bool",
+    "int8": "int8", "int16": "int16", "int32": "int32", "int64": "int64",
+    "uint8": "uint8", "uint16": "uint16", "uint32": "uint32", "uint64": "uint64",
+    "halffloat": "float16", "float": "float32", "double": "float64", "bool": "bool"
+}
+
+
+def _pandas_dtype_name(backend_type, has_nulls: bool) -> str:
+    """Name of the dtype pandas.read_csv would give a column the backend typed as backend_type.
+
+    Missing values turn integer columns into float64 and boolean columns
+    into object, as they do in pandas.
+    """
+    name = _BACKEND_DTYPE_NAMES.get(str(backend_type), "object")
+    if has_nulls and name.startswith(("int", "uint")):
+        return "float64"
+    if has_nulls and name == "bool":
+        return "object"
+    return name
+
+
+def _csv_analysis_polars(path: str, delimiter: str) -> Optional[Dict[str, Any]]:
+    """Build the csv_analyze report with one lazy, multi-threaded polars scan.
+
+    Produces the same layout as the pandas path: null counts for every column
+    and describe()-style statistics for the numeric ones. Returns None for
+    files without numeric columns, whose text summary only pandas produces.
+    """
+    # Infer types from every row, as pandas does, rather than the first 100
+    lf = pl.scan_csv(path, separator=delimiter, infer_schema_length=None,
+                     null_values=_PANDAS_NA_VALUES)
+    schema = lf.collect_schema()
+    columns = schema.names()
+    numeric = [name for name, dtype in schema.items() if dtype.is_numeric()]
+    if not numeric:
+        return None
+    
+    stats = {
+        "count": lambda c: pl.col(c).count(),
+        "mean": lambda c: pl.col(c).mean(),
+        "std": lambda c: pl.col(c).std(),
+        "min": lambda c: pl.col(c).min(),
+        "25%": lambda c: pl.col(c).quantile(0.25, "linear"),
+        "50%": lambda c: pl.col(c).quantile(0.5, "linear"),
+        "75%": lambda c: pl.col(c).quantile(0.75, "linear"),
+        "max": lambda c: pl.col(c).max(),
+    }
+    exprs = [pl.len().alias("rows")]
+    exprs += [pl.col(c).null_count().alias(f"null:{c}") for c in columns]
+    exprs += [
+        expr(c).cast(pl.Float64).alias(f"{stat}:{c}")
+        for c in numeric for stat, expr in stats.items()
+    ]
+    row = lf.select(exprs).collect().row(0, named=True)
+    
+    return {
+        "file": path,
+        "shape": (row["rows"], len(columns)),
+        "columns": columns,
+        "dtypes": {name: _pandas_dtype_name(dtype, row[f"null:{name}"] > 0) for name, dtype in schema.items()},
+        "null_counts": {c: row[f"null:{c}"] for c in columns},
+        "basic_stats": {c: {stat: row[f"{stat}:{c}"] for stat in stats} for c in numeric}
+    }
+
+
+def _csv_analysis_arrow(path: str, delimiter: str) -> Optional[Dict[str, Any]]:
+    """Build the csv_analyze report from a multi-threaded pyarrow CSV read.
+
+    Null counts come straight from each column's validity bitmap and the
+    numeric statistics from pyarrow.compute kernels, so pandas is not needed.
+    Returns None for files without numeric columns, like the polars path.
+    """
+    table = pa_csv.read_csv(
+        path,
+        parse_options=pa_csv.ParseOptions(delimiter=delimiter),
+        # pandas' NA strings, also for text columns, so null counts agree
+        convert_options=pa_csv.ConvertOptions(null_values=_PANDAS_NA_VALUES, strings_can_be_null=True)
+    )
+    
+    def number(scalar) -> Optional[float]:
+        value = scalar.as_py()
+        return None if value is None else float(value)
+    
+    basic_stats = {}
+    for field, column in zip(table.schema, table.columns):
+        if not (pa.types.is_integer(field.type) or pa.types.is_floating(field.type)):
+            continue
+        min_max = pc.min_max(column)
+        quantiles = pc.quantile(column, q=[0.25, 0.5, 0.75], interpolation="linear").to_pylist()
+        basic_stats[field.name] = {
+            "count": float(pc.count(column).as_py()),
+            "mean": number(pc.mean(column)),
+            "std": number(pc.stddev(column, ddof=1)),
+            "min": number(min_max["min"]),
+            "25%": quantiles[0] if quantiles else None,
+            "50%": quantiles[1] if quantiles else None,
+            "75%": quantiles[2] if quantiles else None,
+            "max": number(min_max["max"])
+        }
+    if not basic_stats:
+        return None
+    
+    return {
+        "file": path,
+        "shape": (table.num_rows, table.num_columns),
+        "columns": table.column_names,
+        "dtypes": {
+            field.name: _pandas_dtype_name(field.type, column.null_count > 0)
+            for field, column in zip(table.schema, table.columns)
+        },
+        "null_counts": {name: column.null_count for name, column in zip(table.column_names, table.columns)},
+        "basic_stats": basic_stats
+    }
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _column_stats(values):
+        """Per-column count/mean/std/min/max of a float matrix, skipping NaN.
+
+        Columns are processed in parallel with a single Welford pass each.
+        """
+        n_rows, n_cols = values.shape
+        out = np.full((n_cols, 5), np.nan)
+        for j in prange(n_cols):
+            count = 0
+            mean = 0.0
+            m2 = 0.0
+            lo = np.inf
+            hi = -np.inf
+            for i in range(n_rows):
+                x = values[i, j]
+                if np.isnan(x):
+                    continue
+                count += 1
+                delta = x - mean
+                mean += delta / count
+                m2 += delta * (x - mean)
+                lo = min(lo, x)
+                hi = max(hi, x)
+            out[j, 0] = count
+            if count:
+                out[j, 1] = mean
+                out[j, 3] = lo
+                out[j, 4] = hi
+            if count > 1:
+                out[j, 2] = np.sqrt(m2 / (count - 1))
+        return out
+else:
+    def _column_stats(values):
+        """Per-column count/mean/std/min/max of a float matrix, skipping NaN."""
+        out = np.full((values.shape[1], 5), np.nan)
+        out[:, 0] = (~np.isnan(values)).sum(axis=0)
+        # All-NaN columns legitimately produce NaN; silence the warnings.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            out[:, 1] = np.nanmean(values, axis=0)
+            out[:, 2] = np.nanstd(values, axis=0, ddof=1)
+            out[:, 3] = np.nanmin(values, axis=0)
+            out[:, 4] = np.nanmax(values, axis=0)
+        return out
+
+
+def _data_summary(path: str, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Summarise a CSV or JSON data file, optionally limited to some columns."""
+    df = pd.read_json(path) if path.lower().endswith(".json") else pd.read_csv(path)
+    
+    if columns:
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"Columns not found: {missing}")
+        df = df[columns]
+    
+    numeric = df.select_dtypes(include="number")
+    stats = _column_stats(numeric.to_numpy(dtype=np.float64)) if numeric.shape[1] else []
+    
+    return {
+        "file": path,
+        "rows": len(df),
+        "numeric": {
+            c: dict(zip(("count", "mean", "std", "min", "max"), row.tolist()))
+            for c, row in zip(numeric.columns, stats)
+        },
+        "non_numeric": {
+            c: {"count": int(df[c].count()), "unique": int(df[c].nunique())}
+            for c in df.columns.difference(numeric.columns, sort=False)
+        }
+    }
+
+
+# CSV files at least this large are summarised chunk by chunk so the whole
+# frame never has to fit in memory.
+_CSV_CHUNKED_MIN_BYTES = 256 * 1024 * 1024
+_CSV_CHUNK_ROWS = 1_000_000
+
+
+def _common_csv_dtype(a, b):
+    """dtype read_csv gives a whole column whose chunks parsed as a and b."""
+    if a == b:
+        return a
+    if a.kind in "iuf" and b.kind in "iuf":
+        # e.g. int64 turning float64 at the first missing value
+        return np.result_type(a, b)
+    # Any other mix, such as bools with missing values or numbers with text
+    return np.dtype(object)
+
+
+def _csv_analysis_chunked(path: str, delimiter: str) -> Dict[str, Any]:
+    """Build the csv_analyze report from streamed chunks.
+
+    Per-column count/mean/M2/min/max are merged across chunks with Chan's
+    parallel variance update. Quantiles need the full column, so they are
+    left out of basic_stats here.
+    """
+    rows = 0
+    columns = None
+    dtypes = None
+    null_counts = None
+    acc = {}  # column -> [count, mean, m2, min, max]
+    
+    for chunk in pd.read_csv(path, delimiter=delimiter, chunksize=_CSV_CHUNK_ROWS):
+        numeric = chunk.select_dtypes(include="number")
+        if columns is None:
+            columns = list(chunk.columns)
+            dtypes = chunk.dtypes.to_dict()
+            null_counts = chunk.isnull().sum()
+            acc = {c: None for c in numeric.columns}
+        else:
+            null_counts += chunk.isnull().sum()
+            for c, dtype in chunk.dtypes.items():
+                dtypes[c] = _common_csv_dtype(dtypes[c], dtype)
+        rows += len(chunk)
+        
+        # A column that stops parsing as numeric would be object in a full read
+        for c in [c for c in acc if c not in numeric.columns]:
+            del acc[c]
+        if not acc:
+            continue
+        
+        stats = numeric[list(acc)].agg(["count", "mean", "var", "min", "max"])
+        for c, prev in acc.items():
+            n_b = float(stats.at["count", c])
+            if not n_b:
+                continue
+            mean_b = float(stats.at["mean", c])
+            m2_b = float(stats.at["var", c]) * (n_b - 1) if n_b > 1 else 0.0
+            min_b = float(stats.at["min", c])
+            max_b = float(stats.at["max", c])
+            if prev is None:
+                acc[c] = [n_b, mean_b, m2_b, min_b, max_b]
+                continue
+            n_a, mean_a, m2_a, min_a, max_a = prev
+            n = n_a + n_b
+            delta = mean_b - mean_a
+            acc[c] = [
+                n,
+                mean_a + delta * n_b / n,
+                m2_a + m2_b + delta * delta * n_a * n_b / n,
+                min(min_a, min_b),
+                max(max_a, max_b)
+            ]
+    
+    if columns is None:
+        return _csv_analysis_pandas(path, delimiter)
+    
+    nan = float("nan")
+    basic_stats = {}
+    for c, state in acc.items():
+        n, mean, m2, lo, hi = state or (0.0, nan, nan, nan, nan)
+        basic_stats[c] = {
+            "count": n,
+            "mean": mean,
+            "std": math.sqrt(m2 / (n - 1)) if n > 1 else nan,
+            "min": lo,
+            "max": hi
+        }
+    
+    return {
+        "file": path,
+        "shape": (rows, len(columns)),
+        "columns": columns,
+        "dtypes": dtypes,
+        "null_counts": null_counts.to_dict(),
+        "basic_stats": basic_stats,
+        "chunked": True
+    }
+
+
+def _csv_analysis_pandas(path: str, delimiter: str) -> Dict[str, Any]:
+    """Build the csv_analyze report with pandas.
+
+    Equivalent to describe().to_dict() on the numeric columns, but the
+    non-null counts are computed once and reused for the null counts, and
+    the statistics are read straight out of one agg() and one quantile()
+    result instead of going through describe()'s intermediate frame.
+    """
+    df = pd.read_csv(path, delimiter=delimiter)
+    counts = df.count()
+    numeric = df.select_dtypes(include="number")
+    
+    if numeric.shape[1]:
+        agg = numeric.agg(["mean", "std", "min", "max"])
+        quantiles = numeric.quantile([0.25, 0.5, 0.75])
+        basic_stats = {
+            c: {
+                "count": float(counts[c]),
+                "mean": float(agg.at["mean", c]),
+                "std": float(agg.at["std", c]),
+                "min": float(agg.at["min", c]),
+                "25%": float(quantiles.at[0.25, c]),
+                "50%": float(quantiles.at[0.5, c]),
+                "75%": float(quantiles.at[0.75, c]),
+                "max": float(agg.at["max", c])
+            }
+            for c in numeric.columns
+        }
+    else:
+        # describe() summarises text columns when there are no numeric ones
+        basic_stats = df.describe().to_dict()
+    
+    return {
+        "file": path,
+        "shape": df.shape,
+        "columns": list(df.columns),
+        "dtypes": df.dtypes.to_dict(),
+        "null_counts": (len(df) - counts).to_dict(),
+        "basic_stats": basic_stats
+    }
+
+
+def _csv_analysis(path: str, delimiter: str) -> Dict[str, Any]:
+    """Build the csv_analyze report with the fastest available backend.
+
+    Files too large to load whole are always streamed. Otherwise a fast
+    backend is tried first, and anything it cannot reproduce (a parse it
+    rejects, a text-only file) falls back to pandas.
+    """
+    if os.path.getsize(path) >= _CSV_CHUNKED_MIN_BYTES:
+        return _csv_analysis_chunked(path, delimiter)
+    if POLARS_AVAILABLE:
+        try:
+            report = _csv_analysis_polars(path, delimiter)
+        except Exception:
+            # e.g. values pandas parses but polars rejects
+            report = None
+        return report if report is not None else _csv_analysis_pandas(path, delimiter)
+    if PYARROW_AVAILABLE:
+        try:
+            report = _csv_analysis_arrow(path, delimiter)
+        except pa.ArrowInvalid:
+            # Types are inferred from the first block; a later row that
+            # does not fit is rejected rather than widened as pandas would
+            report = None
+        if report is not None:
+            return report
+    return _csv_analysis_pandas(path, delimiter)
+
+
+# Number of csv_analyze/data_summary reports kept per server.
+_ANALYSIS_CACHE_SIZE = 32
+
 
 class AdvancedMCPServer:
     """Advanced MCP server with file operations and data analysis."""
@@ -37,82 +612,34 @@ class AdvancedMCPServer:
     def __init__(self):
         self.server = Server("advanced-mcp-server")
         self.temp_dir = tempfile.mkdtemp(prefix="mcp_")
+        self._analysis_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._known_dirs: Set[str] = set()
         self.setup_handlers()
     
+    def _cached_analysis(self, params: tuple, build, path: str, *args) -> Dict[str, Any]:
+        """Return build(path, *args), reusing the last report for an unchanged file.
+
+        The key includes the file's mtime and size, so editing the file
+        invalidates its entries without any explicit bookkeeping.
+        """
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size) + params
+        if key in self._analysis_cache:
+            self._analysis_cache.move_to_end(key)
+            return self._analysis_cache[key]
+        
+        report = build(path, *args)
+        self._analysis_cache[key] = report
+        if len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return report
+    
     def setup_handlers(self):
         """Set up MCP handlers."""
         
         @self.server.list_tools()
         async def handle_list_tools() -> List[types.Tool]:
-            tools = [
-                types.Tool(
-                    name="file_read",
-                    description="Read contents of a file",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string", "description": "File path to read"},
-                            "encoding": {"type": "string", "default": "utf-8", "description": "File encoding"}
-                        },
-                        "required": ["path"]
-                    }
-                ),
-                types.Tool(
-                    name="file_write",
-                    description="Write content to a file",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string", "description": "File path to write"},
-                            "content": {"type": "string", "description": "Content to write"},
-                            "encoding": {"type": "string", "default": "utf-8"}
-                        },
-                        "required": ["path", "content"]
-                    }
-                ),
-                types.Tool(
-                    name="directory_list",
-                    description="List directory contents",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "path": {"type": "string", "description": "Directory path to list"},
-                            "show_hidden": {"type": "boolean", "default": False}
-                        },
-                        "required": ["path"]
-                    }
-                )
-            ]
-            
-            if PANDAS_AVAILABLE:
-                tools.extend([
-                    types.Tool(
-                        name="csv_analyze",
-                        description="Analyze CSV file and provide statistics",
-                        inputSchema={
-                            "type": "object",
-                            "properties": {
-                                "path": {"type": "string", "description": "CSV file path"},
-                                "delimiter": {"type": "string", "default": ","}
-                            },
-                            "required": ["path"]
-                        }
-                    ),
-                    types.Tool(
-                        name="data_summary",
-                        description="Generate summary statistics for dataset",
-                        inputSchema={
-                            "type": "object",
-                            "properties": {
-                                "path": {"type": "string", "description": "Data file path"},
-                                "columns": {"type": "array", "items": {"type": "string"}, "description": "Specific columns to analyze"}
-                            },
-                            "required": ["path"]
-                        }
-                    )
-                ])
-            
-            return tools
+            return list(_TOOLS)
         
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
@@ -120,29 +647,43 @@ class AdvancedMCPServer:
                 if name == "file_read":
                     path = arguments["path"]
                     encoding = arguments.get("encoding", "utf-8")
+                    max_chars = _max_chars_argument(arguments)
                     
-                    if not os.path.exists(path):
-                        return [types.TextContent(type="text", text=f"File not found: {path}")]
+                    # Disk reads block, so keep them off the event loop.
+                    loop = asyncio.get_running_loop()
+                    text = await loop.run_in_executor(None, _file_read_reply, path, encoding, max_chars)
+                    
+                    return [types.TextContent.model_construct(type="text", text=text)]
+                
+                elif name == "file_read_batch":
+                    paths = arguments["paths"]
+                    encoding = arguments.get("encoding", "utf-8")
+                    max_chars = _max_chars_argument(arguments)
                     
-                    with open(path, 'r', encoding=encoding) as f:
-                        content = f.read()
+                    # Submit every read at once so they overlap in the thread pool.
+                    loop = asyncio.get_running_loop()
+                    replies = await asyncio.gather(*(
+                        loop.run_in_executor(None, _file_read_reply, path, encoding, max_chars)
+                        for path in paths
+                    ), return_exceptions=True)
                     
-                    return [types.TextContent(
-                        type="text",
-                        text=f"File: {path}\nSize: {len(content)} characters\n\nContent:\n{content}"
-                    )]
+                    return [
+                        types.TextContent.model_construct(
+                            type="text",
+                            text=f"Error reading {path}: {reply}" if isinstance(reply, Exception) else reply
+                        )
+                        for path, reply in zip(paths, replies)
+                    ]
                 
                 elif name == "file_write":
                     path = arguments["path"]
                     content = arguments["content"]
                     encoding = arguments.get("encoding", "utf-8")
                     
-                    os.makedirs(os.path.dirname(path), exist_ok=True)
-                    
-                    with open(path, 'w', encoding=encoding) as f:
-                        f.write(content)
+                    loop = asyncio.get_running_loop()
+                    await loop.run_in_executor(None, _write_text, path, content, encoding, self._known_dirs)
                     
-                    return [types.TextContent(
+                    return [types.TextContent.model_construct(
                         type="text",
                         text=f"Successfully wrote {len(content)} characters to {path}"
                     )]
@@ -152,73 +693,67 @@ class AdvancedMCPServer:
                     show_hidden = arguments.get("show_hidden", False)
                     
                     if not os.path.exists(path):
-                        return [types.TextContent(type="text", text=f"Directory not found: {path}")]
+                        return [types.TextContent.model_construct(type="text", text=f"Directory not found: {path}")]
                     
-                    items = []
-                    for item in os.listdir(path):
-                        if not show_hidden and item.startswith('.'):
-                            continue
-                        
-                        item_path = os.path.join(path, item)
-                        item_type = "DIR" if os.path.isdir(item_path) else "FILE"
-                        size = os.path.getsize(item_path) if os.path.isfile(item_path) else "-"
-                        items.append(f"{item_type:4} {size:>10} {item}")
+                    # scandir yields the entry type from the directory read itself,
+                    # so only regular files need a stat() call for their size.
+                    with os.scandir(path) as entries:
+                        items = [
+                            _format_entry(entry) for entry in entries
+                            if show_hidden or not entry.name.startswith('.')
+                        ]
                     
                     result = f"Directory: {path}\nContents ({len(items)} items):\n\n"
                     result += "\n".join(items)
                     
-                    return [types.TextContent(type="text", text=result)]
+                    return [types.TextContent.model_construct(type="text", text=result)]
                 
                 elif name == "csv_analyze" and PANDAS_AVAILABLE:
                     path = arguments["path"]
                     delimiter = arguments.get("delimiter", ",")
                     
-                    df = pd.read_csv(path, delimiter=delimiter)
+                    analysis = self._cached_analysis(
+                        ("csv_analyze", delimiter), _csv_analysis, path, delimiter
+                    )
                     
-                    analysis = {
-                        "file": path,
-                        "shape": df.shape,
-                        "columns": list(df.columns),
-                        "dtypes": df.dtypes.to_dict(),
-                        "null_counts": df.isnull().sum().to_dict(),
-                        "basic_stats": df.describe().to_dict()
-                    }
+                    return [types.TextContent.model_construct(
+                        type="text",
+                        text=f"CSV Analysis:\n{_dumps(analysis)}"
+                    )]
+                
+                elif name == "data_summary" and PANDAS_AVAILABLE:
+                    path = arguments["path"]
+                    columns = arguments.get("columns")
                     
-                    return [types.TextContent(
+                    summary = self._cached_analysis(
+                        ("data_summary", tuple(columns or ())), _data_summary, path, columns
+                    )
+                    
+                    return [types.TextContent.model_construct(
                         type="text",
-                        text=f"CSV Analysis:\n{json.dumps(analysis, indent=2, default=str)}"
+                        text=f"Data Summary:\n{_dumps(summary)}"
                     )]
                 
                 else:
-                    return [types.TextContent(type="text", text=f"Unknown tool: {name}")]
+                    return [types.TextContent.model_construct(type="text", text=f"Unknown tool: {name}")]
                     
             except Exception as e:
-                return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+                return [types.TextContent.model_construct(type="text", text=f"Error: {str(e)}")]
         
         @self.server.list_resources()
         async def handle_list_resources() -> List[types.Resource]:
-            return [
-                types.Resource(
-                    uri=AnyUrl("advanced://capabilities"),
-                    name="Server Capabilities",
-                    description="Advanced server features and capabilities",
-                    mimeType="application/json"
-                ),
-                types.Resource(
-                    uri=AnyUrl("advanced://temp_workspace"),
-                    name="Temporary Workspace",
-                    description="Information about temporary workspace",
-                    mimeType="application/json"
-                )
-            ]
+            return list(_RESOURCES)
         
         @self.server.read_resource()
         async def handle_read_resource(uri: AnyUrl) -> str:
             if str(uri) == "advanced://capabilities":
                 capabilities = {
-                    "file_operations": ["read", "write", "list_directory"],
+                    "file_operations": ["read", "read_batch", "write", "list_directory"],
                     "data_analysis": ["csv_analysis", "statistics"] if PANDAS_AVAILABLE else ["basic_analysis"],
                     "pandas_available": PANDAS_AVAILABLE,
+                    "polars_available": POLARS_AVAILABLE,
+                    "pyarrow_available": PYARROW_AVAILABLE,
+                    "numba_available": NUMBA_AVAILABLE,
                     "temporary_workspace": self.temp_dir,
                     "supported_formats": ["txt", "csv", "json"],
                     "features": {
@@ -227,7 +762,7 @@ class AdvancedMCPServer:
                         "statistical_analysis": PANDAS_AVAILABLE
                     }
                 }
-                return json.dumps(capabilities, indent=2)
+                return _dumps(capabilities)
             
             elif str(uri) == "advanced://temp_workspace":
                 workspace_info = {
@@ -236,7 +771,7 @@ class AdvancedMCPServer:
                     "files": os.listdir(self.temp_dir) if os.path.exists(self.temp_dir) else [],
                     "created": datetime.now().isoformat()
                 }
-                return json.dumps(workspace_info, indent=2)
+                return _dumps(workspace_info)
             
             raise ValueError(f"Unknown resource: {uri}")
     
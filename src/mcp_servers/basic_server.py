@@ -10,10 +10,12 @@ This script demonstrates a simple MCP server implementation with:
 Perfect for understanding MCP fundamentals.
 """
 
+import ast
 import asyncio
-import json
+import functools
 import os
 import platform
+import re
 import sys
 from datetime import datetime
 from typing import Any, Dict, List, Optional
@@ -23,12 +25,303 @@ import mcp.types as types
 from mcp.server import NotificationOptions, Server
 from pydantic import AnyUrl
 
+try:
+    from ._serialization import dumps as _dumps
+except ImportError:
+    # Run as a script: this directory is on sys.path instead of the package
+    from _serialization import dumps as _dumps
+
+
+# Cheap first-pass denylist, checked before the expression is parsed.
+_DANGEROUS_RE = re.compile(r"import|exec|eval|__")
+
+# Largest integer, in bits, that ** , << , pow() or round() may produce
+# (about 3000 digits). Past this the arithmetic itself would stall the server.
+_MAX_RESULT_BITS = 10000
+
+
+def _bounded_pow(base, exp, mod=None):
+    """pow() that refuses integer results larger than _MAX_RESULT_BITS."""
+    if (mod is None and isinstance(base, int) and isinstance(exp, int)
+            and exp > 0 and (abs(base).bit_length() - 1) * exp > _MAX_RESULT_BITS):
+        raise ValueError("Result too large")
+    return pow(base, exp, mod)
+
+
+def _bounded_lshift(value, shift):
+    """value << shift, refusing integer results larger than _MAX_RESULT_BITS."""
+    if (isinstance(value, int) and isinstance(shift, int) and value
+            and value.bit_length() + shift > _MAX_RESULT_BITS):
+        raise ValueError("Result too large")
+    return value << shift
+
+
+def _bounded_mul(left, right):
+    """left * right, refusing list and tuple repetition."""
+    if isinstance(left, (list, tuple)) or isinstance(right, (list, tuple)):
+        raise ValueError("Lists and tuples cannot be repeated")
+    return left * right
+
+
+def _bounded_round(number, ndigits=None):
+    """round() that refuses the huge powers of ten a very negative ndigits computes."""
+    if isinstance(ndigits, int) and ndigits < 0 and -ndigits * 10 // 3 > _MAX_RESULT_BITS:
+        raise ValueError("Result too large")
+    return round(number, ndigits)
+
+
+# Names the calculator may reference; everything else is rejected at parse time.
+_CALCULATOR_NAMES = {"abs": abs, "round": _bounded_round, "min": min, "max": max, "pow": _bounded_pow}
+
+# Operators whose cost grows with their operands, rewritten into calls to
+# these helpers. The names are not in _CALCULATOR_NAMES, so expressions
+# cannot reference them directly.
+_BOUNDED_OPERATORS = {
+    ast.Pow: ("_bounded_pow", _bounded_pow),
+    ast.LShift: ("_bounded_lshift", _bounded_lshift),
+    ast.Mult: ("_bounded_mul", _bounded_mul),
+}
+
+# Namespace the compiled expressions are evaluated in.
+_CALCULATOR_SCOPE = dict(_CALCULATOR_NAMES, **dict(_BOUNDED_OPERATORS.values()))
+
+_CALCULATOR_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare,
+    ast.operator, ast.unaryop, ast.boolop, ast.cmpop,
+    ast.Constant, ast.Name, ast.Load, ast.Call, ast.keyword, ast.Tuple, ast.List
+)
+
+
+class _BoundOperators(ast.NodeTransformer):
+    """Rewrite the operators in _BOUNDED_OPERATORS into calls to their helpers."""
+    
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        bounded = _BOUNDED_OPERATORS.get(type(node.op))
+        if bounded is None:
+            return node
+        call = ast.Call(
+            func=ast.Name(id=bounded[0], ctx=ast.Load()),
+            args=[node.left, node.right],
+            keywords=[]
+        )
+        return ast.copy_location(call, node)
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_expression(expression: str):
+    """Parse, validate and compile a calculator expression.
+
+    Only arithmetic, comparisons, numeric literals and calls to the functions
+    in _CALCULATOR_NAMES are accepted. **, << and * are routed through
+    bounded helpers so no expression can run for minutes or exhaust memory.
+    Results are cached, so repeated expressions skip the parser and compiler
+    entirely. Evaluate the code in _CALCULATOR_SCOPE.
+    """
+    tree = ast.parse(expression, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _CALCULATOR_NODES):
+            raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in _CALCULATOR_NAMES:
+            raise ValueError(f"Unknown name: {node.id}")
+        if isinstance(node, ast.Call) and not isinstance(node.func, ast.Name):
+            raise ValueError("Only simple function calls are allowed")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ValueError("Only numeric literals are allowed")
+    tree = ast.fix_missing_locations(_BoundOperators().visit(tree))
+    return compile(tree, "<calculator>", "eval")
+
+
+# Tool, resource and prompt listings never change, so they are built once
+# at import instead of on every list_* request.
+_TOOLS = (
+    types.Tool(
+        name="calculator",
+        description="Perform basic mathematical calculations",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "expression": {
+                    "type": "string",
+                    "description": "Mathematical expression to evaluate (e.g., '2 + 3 * 4')"
+                }
+            },
+            "required": ["expression"]
+        }
+    ),
+    types.Tool(
+        name="string_utils",
+        description="String manipulation utilities",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "text": {
+                    "type": "string",
+                    "description": "Text to manipulate"
+                },
+                "operation": {
+                    "type": "string",
+                    "enum": ["uppercase", "lowercase", "reverse", "length", "words"],
+                    "description": "Operation to perform on the text"
+                }
+            },
+            "required": ["text", "operation"]
+        }
+    ),
+    types.Tool(
+        name="get_current_time",
+        description="Get the current date and time",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "format": {
+                    "type": "string",
+                    "description": "Time format (iso, readable, timestamp)",
+                    "enum": ["iso", "readable", "timestamp"],
+                    "default": "readable"
+                }
+            }
+        }
+    )
+)
+
+_RESOURCES = (
+    types.Resource(
+        uri=AnyUrl("basic://system_info"),
+        name="System Information",
+        description="Basic system and environment information",
+        mimeType="application/json"
+    ),
+    types.Resource(
+        uri=AnyUrl("basic://server_config"),
+        name="Server Configuration",
+        description="Basic server configuration and capabilities",
+        mimeType="application/json"
+    ),
+    types.Resource(
+        uri=AnyUrl("basic://help"),
+        name="Help Documentation",
+        description="Basic usage instructions and examples",
+        mimeType="text/plain"
+    )
+)
+
+_PROMPTS = (
+    types.Prompt(
+        name="calculation_helper",
+        description="Helps with mathematical calculations and explanations",
+        arguments=[
+            types.PromptArgument(
+                name="problem",
+                description="Mathematical problem to solve",
+                required=True
+            )
+        ]
+    ),
+    types.Prompt(
+        name="text_processing",
+        description="Assists with text manipulation and analysis",
+        arguments=[
+            types.PromptArgument(
+                name="text",
+                description="Text to process",
+                required=True
+            ),
+            types.PromptArgument(
+                name="task",
+                description="Processing task to perform",
+                required=False
+            )
+        ]
+    )
+)
+
+_HELP_TEXT = """
+# Basic MCP Server Help
+
+## Available Tools:
+
+1. **calculator**
+   - Description: Perform basic mathematical calculations
+   - Usage: Provide a mathematical expression as a string
+   - Example: "2 + 3 * 4" → Result: 14
+
+2. **string_utils**
+   - Description: String manipulation utilities
+   - Operations: uppercase, lowercase, reverse, length, words
+   - Example: text="Hello World", operation="uppercase" → "HELLO WORLD"
+
+3. **get_current_time**
+   - Description: Get current date and time
+   - Formats: iso, readable, timestamp
+   - Example: format="readable" → "2025-08-25 15:30:45"
+
+## Available Resources:
+
+1. **system_info** - System and environment information
+2. **server_config** - Server configuration and capabilities
+3. **help** - This help documentation
+
+## Available Prompts:
+
+1. **calculation_helper** - Assists with mathematical calculations
+2. **text_processing** - Helps with text manipulation tasks
+
+## Usage Examples:
+
+```json
+// Calculator tool call
+{
+  "tool": "calculator",
+  "arguments": {
+    "expression": "10 + 5 * 2"
+  }
+}
+
+// String utils tool call
+{
+  "tool": "string_utils", 
+  "arguments": {
+    "text": "Hello MCP World",
+    "operation": "uppercase"
+  }
+}
+```
+
+For more information, see the project documentation.
+""".strip()
+
+# Serialised once; "created" records when the server process started.
+_SERVER_CONFIG_JSON = _dumps({
+    "server_name": "basic-mcp-server",
+    "version": "1.0.0",
+    "capabilities": {
+        "tools": ["calculator", "string_utils", "get_current_time"],
+        "resources": ["system_info", "server_config", "help"],
+        "prompts": ["calculation_helper", "text_processing"]
+    },
+    "description": "A basic MCP server for learning and demonstration",
+    "author": "MCP Learning Project",
+    "created": datetime.now().isoformat()
+})
+
 
 class BasicMCPServer:
     """A basic MCP server with essential tools and resources."""
     
     def __init__(self):
         self.server = Server("basic-mcp-server")
+        # platform lookups can parse /proc or spawn uname, and never change
+        # while the process is running, so do them once.
+        self._static_system_info = {
+            "platform": platform.system(),
+            "platform_release": platform.release(),
+            "platform_version": platform.version(),
+            "architecture": platform.machine(),
+            "hostname": platform.node(),
+            "processor": platform.processor(),
+            "python_version": sys.version
+        }
         self.setup_handlers()
     
     def setup_handlers(self):
@@ -38,56 +331,7 @@ class BasicMCPServer:
         @self.server.list_tools()
         async def handle_list_tools() -> List[types.Tool]:
             """List available tools."""
-            return [
-                types.Tool(
-                    name="calculator",
-                    description="Perform basic mathematical calculations",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "expression": {
-                                "type": "string",
-                                "description": "Mathematical expression to evaluate (e.g., '2 + 3 * 4')"
-                            }
-                        },
-                        "required": ["expression"]
-                    }
-                ),
-                types.Tool(
-                    name="string_utils",
-                    description="String manipulation utilities",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "text": {
-                                "type": "string",
-                                "description": "Text to manipulate"
-                            },
-                            "operation": {
-                                "type": "string",
-                                "enum": ["uppercase", "lowercase", "reverse", "length", "words"],
-                                "description": "Operation to perform on the text"
-                            }
-                        },
-                        "required": ["text", "operation"]
-                    }
-                ),
-                types.Tool(
-                    name="get_current_time",
-                    description="Get the current date and time",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "format": {
-                                "type": "string",
-                                "description": "Time format (iso, readable, timestamp)",
-                                "enum": ["iso", "readable", "timestamp"],
-                                "default": "readable"
-                            }
-                        }
-                    }
-                )
-            ]
+            return list(_TOOLS)
         
         @self.server.call_tool()
         async def handle_call_tool(
@@ -99,19 +343,20 @@ class BasicMCPServer:
                 try:
                     expression = arguments.get("expression", "")
                     # Basic safety check
-                    if any(dangerous in expression for dangerous in ["import", "exec", "eval", "__"]):
+                    if _DANGEROUS_RE.search(expression):
                         raise ValueError("Unsafe expression detected")
                     
-                    result = eval(expression)
+                    code = _compile_expression(expression)
+                    result = eval(code, {"__builtins__": {}}, _CALCULATOR_SCOPE)
                     return [
-                        types.TextContent(
+                        types.TextContent.model_construct(
                             type="text",
                             text=f"Result: {result}\nExpression: {expression}"
                         )
                     ]
                 except Exception as e:
                     return [
-                        types.TextContent(
+                        types.TextContent.model_construct(
                             type="text",
                             text=f"Error calculating '{expression}': {str(e)}"
                         )
@@ -137,14 +382,14 @@ class BasicMCPServer:
                         result = f"Unknown operation: {operation}"
                     
                     return [
-                        types.TextContent(
+                        types.TextContent.model_construct(
                             type="text",
                             text=f"Operation: {operation}\nInput: {text}\nResult: {result}"
                         )
                     ]
                 except Exception as e:
                     return [
-                        types.TextContent(
+                        types.TextContent.model_construct(
                             type="text",
                             text=f"Error processing text: {str(e)}"
                         )
@@ -163,14 +408,14 @@ class BasicMCPServer:
                         result = now.strftime("%Y-%m-%d %H:%M:%S")
                     
                     return [
-                        types.TextContent(
+                        types.TextContent.model_construct(
                             type="text",
                             text=f"Current time ({format_type}): {result}"
                         )
                     ]
                 except Exception as e:
                     return [
-                        types.TextContent(
+                        types.TextContent.model_construct(
                             type="text",
                             text=f"Error getting time: {str(e)}"
                         )
@@ -178,7 +423,7 @@ class BasicMCPServer:
             
             else:
                 return [
-                    types.TextContent(
+                    types.TextContent.model_construct(
                         type="text",
                         text=f"Unknown tool: {name}"
                     )
@@ -188,26 +433,7 @@ class BasicMCPServer:
         @self.server.list_resources()
         async def handle_list_resources() -> List[types.Resource]:
             """List available resources."""
-            return [
-                types.Resource(
-                    uri=AnyUrl("basic://system_info"),
-                    name="System Information",
-                    description="Basic system and environment information",
-                    mimeType="application/json"
-                ),
-                types.Resource(
-                    uri=AnyUrl("basic://server_config"),
-                    name="Server Configuration",
-                    description="Basic server configuration and capabilities",
-                    mimeType="application/json"
-                ),
-                types.Resource(
-                    uri=AnyUrl("basic://help"),
-                    name="Help Documentation",
-                    description="Basic usage instructions and examples",
-                    mimeType="text/plain"
-                )
-            ]
+            return list(_RESOURCES)
         
         @self.server.read_resource()
         async def handle_read_resource(uri: AnyUrl) -> str:
@@ -215,90 +441,18 @@ class BasicMCPServer:
             
             if str(uri) == "basic://system_info":
                 system_info = {
-                    "platform": platform.system(),
-                    "platform_release": platform.release(),
-                    "platform_version": platform.version(),
-                    "architecture": platform.machine(),
-                    "hostname": platform.node(),
-                    "processor": platform.processor(),
-                    "python_version": sys.version,
+                    **self._static_system_info,
                     "current_working_directory": os.getcwd(),
                     "environment_variables_count": len(os.environ),
                     "timestamp": datetime.now().isoformat()
                 }
-                return json.dumps(system_info, indent=2)
+                return _dumps(system_info)
             
             elif str(uri) == "basic://server_config":
-                config = {
-                    "server_name": "basic-mcp-server",
-                    "version": "1.0.0",
-                    "capabilities": {
-                        "tools": ["calculator", "string_utils", "get_current_time"],
-                        "resources": ["system_info", "server_config", "help"],
-                        "prompts": ["calculation_helper", "text_processing"]
-                    },
-                    "description": "A basic MCP server for learning and demonstration",
-                    "author": "MCP Learning Project",
-                    "created": datetime.now().isoformat()
-                }
-                return json.dumps(config, indent=2)
+                return _SERVER_CONFIG_JSON
             
             elif str(uri) == "basic://help":
-                help_text = """
-# Basic MCP Server Help
-
-## Available Tools:
-
-1. **calculator**
-   - Description: Perform basic mathematical calculations
-   - Usage: Provide a mathematical expression as a string
-   - Example: "2 + 3 * 4" → Result: 14
-
-2. **string_utils**
-   - Description: String manipulation utilities
-   - Operations: uppercase, lowercase, reverse, length, words
-   - Example: text="Hello World", operation="uppercase" → "HELLO WORLD"
-
-3. **get_current_time**
-   - Description: Get current date and time
-   - Formats: iso, readable, timestamp
-   - Example: format="readable" → "2025-08-25 15:30:45"
-
-## Available Resources:
-
-1. **system_info** - System and environment information
-2. **server_config** - Server configuration and capabilities
-3. **help** - This help documentation
-
-## Available Prompts:
-
-1. **calculation_helper** - Assists with mathematical calculations
-2. **text_processing** - Helps with text manipulation tasks
-
-## Usage Examples:
-
-```json
-// Calculator tool call
-{
-  "tool": "calculator",
-  "arguments": {
-    "expression": "10 + 5 * 2"
-  }
-}
-
-// String utils tool call
-{
-  "tool": "string_utils", 
-  "arguments": {
-    "text": "Hello MCP World",
-    "operation": "uppercase"
-  }
-}
-```
-
-For more information, see the project documentation.
-                """
-                return help_text.strip()
+                return _HELP_TEXT
             
             else:
                 raise ValueError(f"Unknown resource: {uri}")
@@ -307,35 +461,7 @@ For more information, see the project documentation.
         @self.server.list_prompts()
         async def handle_list_prompts() -> List[types.Prompt]:
             """List available prompts."""
-            return [
-                types.Prompt(
-                    name="calculation_helper",
-                    description="Helps with mathematical calculations and explanations",
-                    arguments=[
-                        types.PromptArgument(
-                            name="problem",
-                            description="Mathematical problem to solve",
-                            required=True
-                        )
-                    ]
-                ),
-                types.Prompt(
-                    name="text_processing",
-                    description="Assists with text manipulation and analysis",
-                    arguments=[
-                        types.PromptArgument(
-                            name="text",
-                            description="Text to process",
-                            required=True
-                        ),
-                        types.PromptArgument(
-                            name="task",
-                            description="Processing task to perform",
-                            required=False
-                        )
-                    ]
-                )
-            ]
+            return list(_PROMPTS)
         
         @self.server.get_prompt()
         async def handle_get_prompt(
@@ -368,7 +494,7 @@ Remember to be clear and educational in your explanations.
                     messages=[
                         types.PromptMessage(
                             role="user",
-                            content=types.TextContent(
+                            content=types.TextContent.model_construct(
                                 type="text",
                                 text=prompt_text.strip()
                             )
@@ -402,7 +528,7 @@ Be thorough in your analysis and provide useful insights.
                     messages=[
                         types.PromptMessage(
                             role="user",
-                            content=types.TextContent(
+                            content=types.TextContent.model_construct(
                                 type="text",
                                 text=prompt_text.strip()
                             )
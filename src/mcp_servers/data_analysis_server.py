@@ -10,19 +10,33 @@ Specialized MCP server for data analysts with:
 """
 
 import asyncio
-import json
+import atexit
+import gzip
+import hashlib
 import logging
+import logging.handlers
 import os
+import queue
+import stat
 import sys
-from datetime import datetime
+import tempfile
+from collections import deque
+from datetime import date, datetime, time
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 import mcp.server.stdio
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
 from pydantic import AnyUrl
 
+try:
+    from ._serialization import dumps as _dumps
+except ImportError:
+    # Run as a script: this directory is on sys.path instead of the package
+    from _serialization import dumps as _dumps
+
 try:
     import pandas as pd
     import numpy as np
@@ -32,28 +46,564 @@ except ImportError:
     pd = None
     np = None
 
-# Setup logging
+try:
+    import pyarrow  # Also enables pandas' multi-threaded CSV engine
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Setup logging: callers only enqueue records; a listener thread does the
+# formatting and the stderr/file writes off the request path
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.StreamHandler(sys.stderr),
+    logging.FileHandler('mcp_data_analysis.log')
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)  # Flushes queued records on exit
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stderr),
-        logging.FileHandler('mcp_data_analysis.log')
-    ]
+    format='%(message)s',  # Full format is applied by the listener's handlers
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 
+def _text(text: str) -> List[types.TextContent]:
+    """Wrap a tool reply as MCP text content (fields are known valid, so skip validation)."""
+    return [types.TextContent.model_construct(type="text", text=text)]
+
+
+def _render_frame(frame, format_type: str) -> str:
+    """Render a result frame as tab-separated values or, for "table", an aligned table.
+
+    to_csv runs in pandas' C writer; to_string formats every cell through the
+    Python display machinery, which gets slow for wide frames.
+    """
+    if format_type == "table":
+        return frame.to_string()
+    return frame.to_csv(sep="\t")
+
+
+def _all_numeric(df) -> bool:
+    """True if describe() would treat every column of df as numeric."""
+    return len(df.columns) > 0 and all(
+        pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+        for dtype in df.dtypes
+    )
+
+
+def _describe_numeric(numeric_df, percentiles: List[float]):
+    """Equivalent of numeric_df.describe(percentiles=percentiles).
+
+    All percentiles come from a single quantile() call instead of one call
+    per percentile, and the remaining rows from one agg() pass.
+    """
+    quantiles = numeric_df.quantile(percentiles)
+    quantiles.index = [f"{p * 100:g}%" for p in percentiles]
+    return pd.concat([
+        numeric_df.agg(["count", "mean", "std", "min"]),
+        quantiles,
+        numeric_df.agg(["max"])
+    ]).astype(np.float64)
+
+
+# Numeric frames at least this wide use the compiled outlier kernel.
+_NUMBA_OUTLIER_MIN_COLUMNS = 32
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _sorted_quantile(sorted_values, q):
+        """Linear-interpolated quantile of an already sorted array (pandas' default)."""
+        pos = q * (sorted_values.size - 1)
+        lo = int(np.floor(pos))
+        hi = min(lo + 1, sorted_values.size - 1)
+        return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+    
+    @njit(parallel=True, cache=True)
+    def _iqr_outlier_counts(values):
+        """Per-column count of values outside [Q1 - 1.5*IQR, Q3 + 1.5*IQR], ignoring NaN."""
+        counts = np.zeros(values.shape[1], dtype=np.int64)
+        for j in prange(values.shape[1]):
+            column = values[:, j]
+            present = np.sort(column[~np.isnan(column)])
+            if present.size == 0:
+                continue
+            q1 = _sorted_quantile(present, 0.25)
+            q3 = _sorted_quantile(present, 0.75)
+            iqr = q3 - q1
+            low = q1 - 1.5 * iqr
+            high = q3 + 1.5 * iqr
+            count = 0
+            for v in present:
+                if v < low or v > high:
+                    count += 1
+            counts[j] = count
+        return counts
+
+
+# Number of analysis operations kept for data://analysis_history.
+_HISTORY_LIMIT = 1024
+
+# CSVs at least this large get a Parquet copy so reloading them skips parsing.
+_PARQUET_CACHE_MIN_BYTES = 1024 * 1024
+# One directory per user: the temp dir is shared, and a cache file planted by
+# someone else would be loaded in place of the CSV.
+_PARQUET_CACHE_DIR = Path(tempfile.gettempdir()) / (
+    f"mcp_data_analysis_cache-{os.getuid()}" if hasattr(os, "getuid") else "mcp_data_analysis_cache"
+)
+
+
+def _private_cache_dir() -> Optional[Path]:
+    """Create the Parquet cache directory, or None if it is not ours alone."""
+    _PARQUET_CACHE_DIR.mkdir(mode=0o700, exist_ok=True)
+    if hasattr(os, "getuid"):
+        # lstat so a symlink planted at this name is rejected, not followed
+        info = os.lstat(_PARQUET_CACHE_DIR)
+        if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+            logger.warning(f"Not using dataset cache {_PARQUET_CACHE_DIR}: not a private directory")
+            return None
+    return _PARQUET_CACHE_DIR
+
+
+def _read_csv(path: str, delimiter: str):
+    """Read a CSV, reusing a Parquet copy from an earlier load of the same file.
+
+    The cache file name encodes the source's mtime and size, so an edited CSV
+    is parsed again and its stale copy replaced.
+    """
+    source = os.stat(path)
+    if not PYARROW_AVAILABLE or source.st_size < _PARQUET_CACHE_MIN_BYTES:
+        return _parse_csv(path, delimiter)
+    
+    try:
+        cache_dir = _private_cache_dir()
+    except OSError as e:
+        logger.info(f"Dataset cache unavailable: {e}")
+        cache_dir = None
+    if cache_dir is None:
+        return _parse_csv(path, delimiter)
+    
+    key = hashlib.sha1(f"{os.path.abspath(path)}|{delimiter}".encode()).hexdigest()
+    cache_path = cache_dir / f"{key}-{source.st_mtime_ns}-{source.st_size}.parquet"
+    if cache_path.exists():
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable dataset cache {cache_path}: {e}")
+    
+    df = _parse_csv(path, delimiter)
+    tmp_path = None
+    try:
+        for stale in cache_dir.glob(f"{key}-*.parquet"):
+            # Another server may be removing the same entries
+            stale.unlink(missing_ok=True)
+        # Write under a unique name and rename, so a concurrent reader never
+        # sees a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f"{key}-", suffix=".tmp")
+        os.close(fd)
+        df.to_parquet(tmp_path, compression="zstd")
+        os.replace(tmp_path, cache_path)
+        tmp_path = None
+    except Exception as e:
+        # e.g. object columns mixing types, which Parquet cannot store
+        logger.info(f"Not caching {path} as Parquet: {e}")
+    finally:
+        if tmp_path is not None:
+            Path(tmp_path).unlink(missing_ok=True)
+    return df
+
+
+def _parse_csv(path: str, delimiter: str):
+    """Parse a CSV with pandas' multi-threaded pyarrow engine when available.
+
+    The result always matches the default C engine: where the pyarrow engine
+    would differ, the file is parsed with the C engine instead.
+    """
+    # The pyarrow engine only accepts single-character delimiters
+    if PYARROW_AVAILABLE and len(delimiter) == 1:
+        try:
+            df = pd.read_csv(path, delimiter=delimiter, engine="pyarrow")
+        except ImportError as e:
+            # pyarrow older than this pandas supports
+            logger.info(f"pyarrow CSV engine unavailable ({e}); using the C engine")
+        except (pd.errors.ParserError, pyarrow.ArrowInvalid) as e:
+            # Arrow fixes column types from the first block and rejects later
+            # values that do not fit; a genuinely malformed file fails again below
+            logger.info(f"pyarrow CSV engine could not parse {path} ({e}); retrying with the C engine")
+        else:
+            if not _has_temporal_columns(df):
+                return df
+            # Arrow always infers dates and times, which the C engine keeps as text
+            logger.info(f"Re-parsing {path} with the C engine to keep date/time columns as text")
+    return pd.read_csv(path, delimiter=delimiter)
+
+
+def _has_temporal_columns(df) -> bool:
+    """True if any column holds dates, times or timestamps."""
+    for i in range(df.shape[1]):
+        column = df.iloc[:, i]
+        if column.dtype.kind in "mM":
+            return True
+        if column.dtype == object:
+            # Arrow columns are homogeneous, so the first value tells the type
+            first = column.first_valid_index()
+            if first is not None and isinstance(column[first], (date, time)):
+                return True
+    return False
+
+
+def _downcast_integers(df):
+    """Store int64 columns in the narrowest integer type that holds their values.
+
+    Lossless, and every later scan (quantiles, correlations, null checks)
+    touches fewer bytes. Floats stay float64 because narrowing them would
+    change the reported statistics.
+    """
+    for col in df.select_dtypes(include=["int64"]).columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+
+# Rows parsed to reject a text column as non-numeric before a full scan.
+_NUMERIC_PROBE_ROWS = 1000
+
+
+def _numeric_convertible(series) -> bool:
+    """True if pd.to_numeric would accept every value of series."""
+    try:
+        coerced = pd.to_numeric(series, errors="coerce")
+        # Values coerced to NaN are either rejected or strings such as "nan"
+        # that to_numeric parses as NaN; only a strict parse of those tells
+        # them apart, and it stops at the first rejected value
+        unparsed = series[coerced.isna() & series.notna()]
+        if len(unparsed):
+            pd.to_numeric(unparsed)
+    except (TypeError, ValueError):
+        # Unhashable or nested values are rejected even when coercing
+        return False
+    return True
+
+
+def _missing_and_unique(df):
+    """Equivalent of (df.isnull().sum(), df.nunique()) in one pass over the columns.
+
+    Both counts are taken while a column is in cache, and the distinct count
+    reuses unique() instead of hashing the column a second time.
+    """
+    missing, unique = [], []
+    for i in range(df.shape[1]):
+        values = df.iloc[:, i]
+        uniques = values.unique()
+        missing.append(int(values.isna().sum()))
+        unique.append(len(uniques) - int(pd.isna(uniques).sum()))
+    return (pd.Series(missing, index=df.columns, dtype="int64"),
+            pd.Series(unique, index=df.columns, dtype="int64"))
+
+
+# Rows of object columns sized exactly when estimating a dataset's memory.
+_MEMORY_SAMPLE_ROWS = 1000
+
+
+def _estimate_memory_bytes(df) -> int:
+    """Approximate df.memory_usage(deep=True).sum() without sizing every string.
+
+    Fixed-width columns are counted exactly; object columns are sized on a
+    seeded row sample and scaled up to the full length.
+    """
+    total = int(df.memory_usage(deep=False).sum())
+    objects = df.select_dtypes(include=["object"])
+    if objects.shape[1] == 0 or len(df) <= _MEMORY_SAMPLE_ROWS:
+        return total if objects.shape[1] == 0 else int(df.memory_usage(deep=True).sum())
+    
+    sample = objects.sample(_MEMORY_SAMPLE_ROWS, random_state=0)
+    deep = sample.memory_usage(deep=True, index=False).sum() * (len(df) / _MEMORY_SAMPLE_ROWS)
+    return total - int(objects.memory_usage(deep=False, index=False).sum()) + int(deep)
+
+
+def _fast_head_records(df, n: int = 10) -> List[Dict[str, Any]]:
+    """Equivalent of df.head(n).to_dict(orient='records'), built column by column.
+
+    Series.tolist() unboxes a whole column at once (numbers to Python scalars,
+    datetimes to Timestamps), avoiding to_dict's per-cell boxing.
+    """
+    head = df.head(n)
+    cols = list(head.columns)
+    values = [head.iloc[:, i].tolist() for i in range(len(cols))]
+    return [dict(zip(cols, row)) for row in zip(*values)]
+
+
+_ANALYSIS_GUIDE = """
+# Data Analysis MCP Server Guide
+
+This server provides comprehensive data analysis capabilities for data analysts.
+
+## Workflow:
+
+1. **Load Dataset**: Use `load_dataset` to load CSV or JSON files
+2. **Explore Data**: Use `dataset_info` to understand your data structure
+3. **Quality Check**: Run `data_quality_check` to identify issues
+4. **Statistical Analysis**: Use `calculate_statistics` for descriptive stats
+5. **Find Relationships**: Use `find_correlations` to discover patterns
+6. **Group Analysis**: Use `group_analysis` for segmentation
+7. **Get Insights**: Use `generate_insights` for automated recommendations
+
+## Example Workflow:
+
+```
+1. load_dataset(path="data/sales.csv", name="sales")
+2. dataset_info(name="sales")
+3. data_quality_check(name="sales")
+4. calculate_statistics(name="sales")
+5. find_correlations(name="sales", threshold=0.5)
+6. group_analysis(name="sales", group_by="region")
+7. generate_insights(name="sales", focus="recommendations")
+```
+
+## Tips for Data Analysts:
+
+- Always start with data quality checks
+- Use correlation analysis to identify multicollinearity
+- Group analysis is perfect for segmentation studies
+- Automated insights help identify patterns you might miss
+- Clean your data before statistical analysis
+
+## Supported Formats:
+- CSV files (with custom delimiters)
+- JSON files
+- Pandas-compatible formats
+
+## Statistical Methods:
+- Descriptive statistics (mean, median, std, etc.)
+- Correlation analysis (Pearson, Spearman, Kendall)
+- Outlier detection (IQR method)
+- Missing data analysis
+- Unique value analysis
+""".strip()
+
+# Same guide, compressed once for clients that read data://analysis_guide.gz
+_ANALYSIS_GUIDE_GZ = gzip.compress(_ANALYSIS_GUIDE.encode("utf-8"))
+
+
+_STATIC_RESOURCES = (
+    types.Resource(
+        uri=AnyUrl("data://loaded_datasets"),
+        name="Loaded Datasets",
+        description="Information about currently loaded datasets",
+        mimeType="application/json"
+    ),
+    types.Resource(
+        uri=AnyUrl("data://analysis_guide"),
+        name="Data Analysis Guide",
+        description="Guide for performing data analysis with this server",
+        mimeType="text/plain"
+    ),
+    types.Resource(
+        uri=AnyUrl("data://analysis_guide.gz"),
+        name="Data Analysis Guide (gzip)",
+        description="The analysis guide as gzip-compressed UTF-8 text",
+        mimeType="application/gzip"
+    ),
+    types.Resource(
+        uri=AnyUrl("data://analysis_history"),
+        name="Analysis History",
+        description="History of analysis operations performed",
+        mimeType="application/json"
+    )
+)
+
+
+class _DatasetSummary:
+    """Whole-frame reductions for one version of a loaded dataset.
+
+    Each value is computed on first use and then reused until the dataset is
+    replaced, at which point the server drops the summary.
+    """
+    
+    def __init__(self, name: str, df):
+        self.name = name
+        self.df = df
+        self.insights: Dict[str, List[str]] = {}  # focus -> insight lines
+    
+    @cached_property
+    def _column_counts(self):
+        return _missing_and_unique(self.df)
+    
+    @cached_property
+    def null_counts(self):
+        return self._column_counts[0]
+    
+    @cached_property
+    def nunique(self):
+        return self._column_counts[1]
+    
+    @cached_property
+    def null_counts_dict(self) -> Dict[Any, int]:
+        # tolist() gives Python ints, which both JSON encoders write alike
+        return dict(zip(self.df.columns, self.null_counts.tolist()))
+    
+    @cached_property
+    def nunique_dict(self) -> Dict[Any, int]:
+        return dict(zip(self.df.columns, self.nunique.tolist()))
+    
+    @cached_property
+    def dtypes_str(self) -> Dict[str, str]:
+        return dict(zip(self.df.columns, map(str, self.df.dtypes.values)))
+    
+    @cached_property
+    def numeric_cols(self) -> List[str]:
+        return self.df.select_dtypes(include=[np.number]).columns.tolist()
+    
+    @cached_property
+    def numeric_df(self):
+        return self.df[self.numeric_cols]
+    
+    @cached_property
+    def describe(self):
+        # With the numeric columns already known, an all-numeric frame skips
+        # describe()'s own dtype scan and per-percentile quantile calls
+        if self.numeric_cols and len(self.numeric_cols) == self.df.shape[1]:
+            return _describe_numeric(self.df, [.25, .5, .75])
+        return self.df.describe()
+    
+    @cached_property
+    def describe_dict(self) -> Dict[Any, Dict[str, Any]]:
+        """describe().to_dict(), built from one tolist() per column."""
+        desc = self.describe
+        stats = desc.index.tolist()
+        return {col: dict(zip(stats, desc.iloc[:, i].tolist())) for i, col in enumerate(desc.columns)}
+    
+    @cached_property
+    def memory_bytes(self) -> int:
+        return int(self.df.memory_usage(deep=True).sum())
+    
+    @cached_property
+    def listing(self) -> Dict[str, Any]:
+        """Entry for this dataset in data://loaded_datasets."""
+        # Reuse the exact figure if a tool already computed it
+        memory = self.__dict__.get("memory_bytes")
+        if memory is None:
+            memory = _estimate_memory_bytes(self.df)
+        return {
+            "shape": self.df.shape,
+            "columns": self.df.columns.tolist(),
+            "dtypes": self.dtypes_str,
+            "memory_usage_mb": memory / (1024 * 1024)
+        }
+    
+    @cached_property
+    def resource_json(self) -> str:
+        """Serialized data://dataset/<name> payload."""
+        df = self.df
+        info = {
+            "name": self.name,
+            "shape": df.shape,
+            "columns": df.columns.tolist(),
+            "dtypes": self.dtypes_str,
+            "sample_data": _fast_head_records(df, 10),
+            "summary_statistics": self.describe_dict if len(self.numeric_cols) > 0 else {},
+            "missing_data": self.null_counts_dict,
+            "unique_counts": self.nunique_dict
+        }
+        return _dumps(info)
+
+
 class DataAnalysisMCPServer:
     """MCP server specialized for data analysis tasks."""
     
+    # Comparison operators accepted in filter_data conditions
+    _OP_TABLE = {
+        "==": np.equal,
+        "!=": np.not_equal,
+        ">": np.greater,
+        "<": np.less,
+        ">=": np.greater_equal,
+        "<=": np.less_equal
+    } if PANDAS_AVAILABLE else {}
+    
     def __init__(self):
         self.server = Server("data-analysis-mcp-server")
         self.datasets = {}  # Cache for loaded datasets
-        self.analysis_history = []  # Track analysis operations
+        self.analysis_history = deque(maxlen=_HISTORY_LIMIT)  # Most recent analysis operations
+        self._history_json = deque(maxlen=_HISTORY_LIMIT)  # Same entries, serialized as list items
+        self._summary_cache: Dict[str, _DatasetSummary] = {}
+        # Static resources plus one per dataset, extended as datasets are added
+        self._resource_cache: List[types.Resource] = list(_STATIC_RESOURCES)
+        self._loaded_datasets_json: Optional[str] = None  # Reset whenever a dataset changes
+        # Fixed resource URIs; data://dataset/<name> is matched by prefix
+        self._resource_handlers = {
+            "data://loaded_datasets": self._read_loaded_datasets,
+            "data://analysis_guide": self._read_guide,
+            "data://analysis_guide.gz": self._read_guide_gz,
+            "data://analysis_history": self._read_history
+        }
         logger.info("Initializing Data Analysis MCP Server")
         self.setup_handlers()
     
+    def _set_dataset(self, name: str, df) -> None:
+        """Store a dataset under name, invalidating anything cached for it."""
+        if name not in self.datasets:
+            self._resource_cache.append(types.Resource(
+                uri=AnyUrl(f"data://dataset/{name}"),
+                name=f"Dataset: {name}",
+                description=f"Detailed information about {name} dataset",
+                mimeType="application/json"
+            ))
+        self.datasets[name] = df
+        self._summary_cache.pop(name, None)
+        self._loaded_datasets_json = None
+    
+    def _summary(self, name: str) -> _DatasetSummary:
+        """Return the cached summary for the current version of a dataset."""
+        summary = self._summary_cache.get(name)
+        if summary is None:
+            summary = self._summary_cache[name] = _DatasetSummary(name, self.datasets[name])
+        return summary
+    
+    def _record_history(self, entry: Dict[str, Any]) -> None:
+        """Append an entry to the analysis history, serializing it once."""
+        self.analysis_history.append(entry)
+        # Pre-indented to sit inside the list, matching _dumps(history)
+        self._history_json.append("  " + _dumps(entry).replace("\n", "\n  "))
+    
+    def _read_loaded_datasets(self) -> str:
+        """data://loaded_datasets, serialized once per change to the dataset set."""
+        if self._loaded_datasets_json is None:
+            dataset_info = {name: self._summary(name).listing for name in self.datasets}
+            self._loaded_datasets_json = _dumps(dataset_info)
+        return self._loaded_datasets_json
+    
+    def _read_guide(self) -> str:
+        """data://analysis_guide"""
+        return _ANALYSIS_GUIDE
+    
+    def _read_guide_gz(self) -> bytes:
+        """data://analysis_guide.gz, returned as a binary blob"""
+        return _ANALYSIS_GUIDE_GZ
+    
+    def _read_history(self) -> str:
+        """data://analysis_history"""
+        if not self._history_json:
+            return "[]"
+        return "[\n" + ",\n".join(self._history_json) + "\n]"
+    
     def setup_handlers(self):
         """Set up MCP handlers for data analysis."""
         
@@ -69,7 +619,8 @@ class DataAnalysisMCPServer:
                         "properties": {
                             "path": {"type": "string", "description": "Path to dataset file"},
                             "name": {"type": "string", "description": "Name to reference this dataset"},
-                            "delimiter": {"type": "string", "default": ",", "description": "CSV delimiter"}
+                            "delimiter": {"type": "string", "default": ",", "description": "CSV delimiter"},
+                            "downcast_integers": {"type": "boolean", "default": True, "description": "Store integer columns in the smallest type that holds their values"}
                         },
                         "required": ["path", "name"]
                     }
@@ -93,7 +644,8 @@ class DataAnalysisMCPServer:
                         "properties": {
                             "name": {"type": "string", "description": "Dataset name"},
                             "columns": {"type": "array", "items": {"type": "string"}, "description": "Specific columns (optional)"},
-                            "include_percentiles": {"type": "boolean", "default": True}
+                            "include_percentiles": {"type": "boolean", "default": True},
+                            "format": {"type": "string", "enum": ["tsv", "table"], "default": "tsv", "description": "Tab-separated values or an aligned text table"}
                         },
                         "required": ["name"]
                     }
@@ -106,7 +658,8 @@ class DataAnalysisMCPServer:
                         "properties": {
                             "name": {"type": "string", "description": "Dataset name"},
                             "method": {"type": "string", "enum": ["pearson", "spearman", "kendall"], "default": "pearson"},
-                            "threshold": {"type": "number", "default": 0.5, "description": "Minimum correlation threshold"}
+                            "threshold": {"type": "number", "default": 0.5, "description": "Minimum correlation threshold"},
+                            "format": {"type": "string", "enum": ["tsv", "table"], "default": "tsv", "description": "Layout of the full correlation matrix"}
                         },
                         "required": ["name"]
                     }
@@ -183,10 +736,7 @@ class DataAnalysisMCPServer:
             """Handle tool execution for data analysis."""
             
             if not PANDAS_AVAILABLE:
-                return [types.TextContent(
-                    type="text",
-                    text="Error: pandas is required for data analysis features. Please install pandas."
-                )]
+                return _text("Error: pandas is required for data analysis features. Please install pandas.")
             
             try:
                 logger.info(f"Executing tool: {name} with arguments: {arguments}")
@@ -197,58 +747,59 @@ class DataAnalysisMCPServer:
                     delimiter = arguments.get("delimiter", ",")
                     
                     if not os.path.exists(path):
-                        return [types.TextContent(type="text", text=f"File not found: {path}")]
+                        return _text(f"File not found: {path}")
                     
                     # Load dataset based on file extension
                     if path.endswith('.csv'):
-                        df = pd.read_csv(path, delimiter=delimiter)
+                        df = _read_csv(path, delimiter)
                     elif path.endswith('.json'):
                         df = pd.read_json(path)
                     else:
-                        return [types.TextContent(type="text", text="Unsupported file format. Use CSV or JSON.")]
+                        return _text("Unsupported file format. Use CSV or JSON.")
                     
-                    self.datasets[dataset_name] = df
+                    if arguments.get("downcast_integers", True):
+                        df = _downcast_integers(df)
+                    
+                    self._set_dataset(dataset_name, df)
                     
                     result = f"Dataset '{dataset_name}' loaded successfully!\n"
                     result += f"Shape: {df.shape[0]} rows, {df.shape[1]} columns\n"
                     result += f"Columns: {list(df.columns)}\n"
-                    result += f"Memory usage: {df.memory_usage(deep=True).sum() / 1024:.2f} KB"
+                    result += f"Memory usage: {self._summary(dataset_name).memory_bytes / 1024:.2f} KB"
                     
                     logger.info(f"Successfully loaded dataset '{dataset_name}' with shape {df.shape}")
-                    self.analysis_history.append({
+                    self._record_history({
                         "action": "load_dataset",
                         "dataset": dataset_name,
                         "timestamp": datetime.now().isoformat(),
-                        "details": {"shape": df.shape, "columns": list(df.columns)}
+                        "details": {"shape": df.shape, "columns": df.columns.tolist()}
                     })
                     
-                    return [types.TextContent(type="text", text=result)]
+                    return _text(result)
                 
                 elif name == "dataset_info":
                     dataset_name = arguments["name"]
                     
                     if dataset_name not in self.datasets:
-                        return [types.TextContent(type="text", text=f"Dataset '{dataset_name}' not found. Load it first.")]
+                        return _text(f"Dataset '{dataset_name}' not found. Load it first.")
                     
                     df = self.datasets[dataset_name]
+                    summary = self._summary(dataset_name)
                     
                     info = {
                         "name": dataset_name,
                         "shape": {"rows": df.shape[0], "columns": df.shape[1]},
                         "columns": {
-                            "names": list(df.columns),
-                            "types": df.dtypes.astype(str).to_dict(),
-                            "null_counts": df.isnull().sum().to_dict(),
-                            "unique_counts": df.nunique().to_dict()
+                            "names": df.columns.tolist(),
+                            "types": summary.dtypes_str,
+                            "null_counts": summary.null_counts_dict,
+                            "unique_counts": summary.nunique_dict
                         },
-                        "memory_usage_mb": df.memory_usage(deep=True).sum() / (1024 * 1024),
-                        "sample_data": df.head().to_dict(orient='records')
+                        "memory_usage_mb": summary.memory_bytes / (1024 * 1024),
+                        "sample_data": _fast_head_records(df, 5)
                     }
                     
-                    return [types.TextContent(
-                        type="text",
-                        text=f"Dataset Information:\n{json.dumps(info, indent=2, default=str)}"
-                    )]
+                    return _text(f"Dataset Information:\n{_dumps(info)}")
                 
                 elif name == "calculate_statistics":
                     dataset_name = arguments["name"]
@@ -256,24 +807,22 @@ class DataAnalysisMCPServer:
                     include_percentiles = arguments.get("include_percentiles", True)
                     
                     if dataset_name not in self.datasets:
-                        return [types.TextContent(type="text", text=f"Dataset '{dataset_name}' not found.")]
+                        return _text(f"Dataset '{dataset_name}' not found.")
                     
                     df = self.datasets[dataset_name]
                     
                     if columns:
                         df_subset = df[columns]
                     else:
-                        df_subset = df.select_dtypes(include=[np.number])
+                        df_subset = self._summary(dataset_name).numeric_df
                     
-                    if include_percentiles:
-                        stats = df_subset.describe(percentiles=[.25, .5, .75, .9, .95])
+                    percentiles = [.25, .5, .75, .9, .95] if include_percentiles else [.25, .5, .75]
+                    if _all_numeric(df_subset):
+                        stats = _describe_numeric(df_subset, percentiles)
                     else:
-                        stats = df_subset.describe()
+                        stats = df_subset.describe(percentiles=percentiles)
                     
-                    return [types.TextContent(
-                        type="text",
-                        text=f"Descriptive Statistics for '{dataset_name}':\n{stats.to_string()}"
-                    )]
+                    return _text(f"Descriptive Statistics for '{dataset_name}':\n{_render_frame(stats, arguments.get('format', 'tsv'))}")
                 
                 elif name == "find_correlations":
                     dataset_name = arguments["name"]
@@ -281,25 +830,36 @@ class DataAnalysisMCPServer:
                     threshold = arguments.get("threshold", 0.5)
                     
                     if dataset_name not in self.datasets:
-                        return [types.TextContent(type="text", text=f"Dataset '{dataset_name}' not found.")]
+                        return _text(f"Dataset '{dataset_name}' not found.")
                     
-                    df = self.datasets[dataset_name]
-                    numeric_df = df.select_dtypes(include=[np.number])
-                    
-                    corr_matrix = numeric_df.corr(method=method)
-                    
-                    # Find high correlations
-                    high_corr = []
-                    for i in range(len(corr_matrix.columns)):
-                        for j in range(i+1, len(corr_matrix.columns)):
-                            corr_val = corr_matrix.iloc[i, j]
-                            if abs(corr_val) >= threshold:
-                                high_corr.append({
-                                    "column1": corr_matrix.columns[i],
-                                    "column2": corr_matrix.columns[j],
-                                    "correlation": round(corr_val, 3),
-                                    "strength": "Strong" if abs(corr_val) >= 0.7 else "Moderate"
-                                })
+                    numeric_df = self._summary(dataset_name).numeric_df
+                    
+                    values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+                    if method == "pearson" and values.shape[1] > 1 and not np.isnan(values).any():
+                        # Without missing values pairwise deletion is a no-op, so
+                        # NumPy's BLAS-backed corrcoef gives the same matrix faster.
+                        with np.errstate(divide="ignore", invalid="ignore"):
+                            corr = np.corrcoef(values, rowvar=False)
+                        corr_matrix = pd.DataFrame(corr, index=numeric_df.columns, columns=numeric_df.columns)
+                    else:
+                        corr_matrix = numeric_df.corr(method=method)
+                    
+                    # Find high correlations in the upper triangle (NaN never passes)
+                    columns = corr_matrix.columns
+                    rows_idx, cols_idx = np.triu_indices(len(columns), k=1)
+                    pair_values = corr_matrix.to_numpy()[rows_idx, cols_idx]
+                    keep = np.abs(pair_values) >= threshold
+                    high_corr = [
+                        {
+                            "column1": columns[i],
+                            "column2": columns[j],
+                            "correlation": round(corr_val, 3),
+                            "strength": "Strong" if abs(corr_val) >= 0.7 else "Moderate"
+                        }
+                        for i, j, corr_val in zip(
+                            rows_idx[keep].tolist(), cols_idx[keep].tolist(), pair_values[keep].tolist()
+                        )
+                    ]
                     
                     result = f"Correlation Analysis ({method}) for '{dataset_name}':\n\n"
                     result += f"High correlations (threshold: {threshold}):\n"
@@ -310,9 +870,9 @@ class DataAnalysisMCPServer:
                     if not high_corr:
                         result += "No correlations found above the threshold.\n"
                     
-                    result += f"\nFull correlation matrix:\n{corr_matrix.round(3).to_string()}"
+                    result += f"\nFull correlation matrix:\n{_render_frame(corr_matrix.round(3), arguments.get('format', 'tsv'))}"
                     
-                    return [types.TextContent(type="text", text=result)]
+                    return _text(result)
                 
                 elif name == "group_analysis":
                     dataset_name = arguments["name"]
@@ -321,143 +881,154 @@ class DataAnalysisMCPServer:
                     operations = arguments.get("operations", ["mean", "count"])
                     
                     if dataset_name not in self.datasets:
-                        return [types.TextContent(type="text", text=f"Dataset '{dataset_name}' not found.")]
+                        return _text(f"Dataset '{dataset_name}' not found.")
                     
                     df = self.datasets[dataset_name]
                     
                     if group_by not in df.columns:
-                        return [types.TextContent(type="text", text=f"Column '{group_by}' not found in dataset.")]
+                        return _text(f"Column '{group_by}' not found in dataset.")
                     
                     if agg_columns:
                         df_agg = df.groupby(group_by)[agg_columns].agg(operations)
                     else:
-                        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+                        numeric_cols = self._summary(dataset_name).numeric_cols
                         df_agg = df.groupby(group_by)[numeric_cols].agg(operations)
                     
                     result = f"Group Analysis for '{dataset_name}' grouped by '{group_by}':\n\n"
                     result += df_agg.to_string()
                     
-                    return [types.TextContent(type="text", text=result)]
+                    return _text(result)
                 
                 elif name == "data_quality_check":
                     dataset_name = arguments["name"]
                     
                     if dataset_name not in self.datasets:
-                        return [types.TextContent(type="text", text=f"Dataset '{dataset_name}' not found.")]
+                        return _text(f"Dataset '{dataset_name}' not found.")
                     
                     df = self.datasets[dataset_name]
+                    summary = self._summary(dataset_name)
+                    null_counts = summary.null_counts
+                    # Row hashing is the most expensive step here; do it once
+                    duplicate_rows = int(df.duplicated().sum())
                     
                     quality_report = {
                         "dataset": dataset_name,
                         "total_rows": len(df),
                         "total_columns": len(df.columns),
                         "missing_data": {
-                            "columns_with_missing": df.columns[df.isnull().any()].tolist(),
-                            "missing_percentages": (df.isnull().sum() / len(df) * 100).round(2).to_dict(),
-                            "total_missing_values": df.isnull().sum().sum()
+                            "columns_with_missing": df.columns[null_counts > 0].tolist(),
+                            "missing_percentages": dict(zip(df.columns, (null_counts / len(df) * 100).round(2).tolist())),
+                            "total_missing_values": int(null_counts.sum())
                         },
                         "duplicates": {
-                            "duplicate_rows": df.duplicated().sum(),
-                            "duplicate_percentage": round(df.duplicated().sum() / len(df) * 100, 2)
+                            "duplicate_rows": duplicate_rows,
+                            "duplicate_percentage": round(duplicate_rows / len(df) * 100, 2) if len(df) else 0.0
                         },
-                        "data_types": df.dtypes.astype(str).to_dict(),
-                        "unique_values": df.nunique().to_dict(),
+                        "data_types": summary.dtypes_str,
+                        "unique_values": summary.nunique_dict,
                         "potential_issues": []
                     }
                     
-                    # Identify potential issues
-                    for col in df.columns:
-                        if df[col].isnull().sum() > 0:
-                            missing_pct = df[col].isnull().sum() / len(df) * 100
-                            if missing_pct > 50:
-                                quality_report["potential_issues"].append(f"Column '{col}' has {missing_pct:.1f}% missing values")
+                    # Identify potential issues from the frame-wide reductions above,
+                    # keeping the per-column order of the messages
+                    n_rows = len(df)
+                    issues = quality_report["potential_issues"]
+                    for col, n_missing, n_unique in zip(df.columns, null_counts.tolist(), summary.nunique.tolist()):
+                        if n_missing and n_missing / n_rows * 100 > 50:
+                            issues.append(f"Column '{col}' has {n_missing / n_rows * 100:.1f}% missing values")
                         
-                        if df[col].nunique() == 1:
-                            quality_report["potential_issues"].append(f"Column '{col}' has only one unique value")
+                        if n_unique == 1:
+                            issues.append(f"Column '{col}' has only one unique value")
                         
-                        if df[col].nunique() == len(df):
-                            quality_report["potential_issues"].append(f"Column '{col}' has all unique values (potential identifier)")
+                        if n_unique == n_rows:
+                            issues.append(f"Column '{col}' has all unique values (potential identifier)")
                     
-                    return [types.TextContent(
-                        type="text",
-                        text=f"Data Quality Report:\n{json.dumps(quality_report, indent=2, default=str)}"
-                    )]
+                    return _text(f"Data Quality Report:\n{_dumps(quality_report)}")
                 
                 elif name == "generate_insights":
                     dataset_name = arguments["name"]
                     focus = arguments.get("focus", "overview")
                     
                     if dataset_name not in self.datasets:
-                        return [types.TextContent(type="text", text=f"Dataset '{dataset_name}' not found.")]
+                        return _text(f"Dataset '{dataset_name}' not found.")
                     
                     df = self.datasets[dataset_name]
-                    insights = []
+                    summary = self._summary(dataset_name)
                     
-                    if focus in ["overview", "all"]:
-                        insights.append(f"📊 Dataset Overview:")
-                        insights.append(f"• Contains {len(df)} records with {len(df.columns)} features")
-                        insights.append(f"• Data types: {df.dtypes.value_counts().to_dict()}")
+                    # Insights only depend on the data, so reuse them until it changes
+                    insights = summary.insights.get(focus)
+                    if insights is None:
+                        insights = []
+                        
+                        if focus in ["overview", "all"]:
+                            insights.append(f"📊 Dataset Overview:")
+                            insights.append(f"• Contains {len(df)} records with {len(df.columns)} features")
+                            insights.append(f"• Data types: {df.dtypes.value_counts().to_dict()}")
                         
-                        numeric_cols = df.select_dtypes(include=[np.number]).columns
-                        if len(numeric_cols) > 0:
-                            insights.append(f"• {len(numeric_cols)} numeric columns for analysis")
-                    
-                    if focus in ["outliers", "all"]:
-                        insights.append(f"\n🔍 Outlier Detection:")
-                        numeric_df = df.select_dtypes(include=[np.number])
-                        for col in numeric_df.columns:
-                            Q1 = numeric_df[col].quantile(0.25)
-                            Q3 = numeric_df[col].quantile(0.75)
-                            IQR = Q3 - Q1
-                            outliers = len(numeric_df[(numeric_df[col] < Q1 - 1.5*IQR) | 
-                                                    (numeric_df[col] > Q3 + 1.5*IQR)])
-                            if outliers > 0:
-                                insights.append(f"• {col}: {outliers} potential outliers detected")
-                    
-                    if focus in ["patterns", "all"]:
-                        insights.append(f"\n📈 Pattern Analysis:")
-                        # Find columns with high cardinality
-                        for col in df.columns:
-                            unique_ratio = df[col].nunique() / len(df)
-                            if unique_ratio > 0.95:
-                                insights.append(f"• {col}: High uniqueness ({unique_ratio:.2%}) - potential identifier")
-                            elif unique_ratio < 0.05:
-                                insights.append(f"• {col}: Low uniqueness ({unique_ratio:.2%}) - limited variability")
-                    
-                    if focus in ["recommendations", "all"]:
-                        insights.append(f"\n💡 Recommendations:")
+                            numeric_cols = summary.numeric_cols
+                            if len(numeric_cols) > 0:
+                                insights.append(f"• {len(numeric_cols)} numeric columns for analysis")
                         
-                        # Missing data recommendations
-                        missing_cols = df.columns[df.isnull().any()].tolist()
-                        if missing_cols:
-                            insights.append(f"• Address missing data in: {', '.join(missing_cols)}")
+                        if focus in ["outliers", "all"]:
+                            insights.append(f"\n🔍 Outlier Detection:")
+                            numeric_df = summary.numeric_df
+                            if len(numeric_df.columns) > 0:
+                                values = numeric_df.to_numpy(dtype=np.float64, na_value=np.nan)
+                                if NUMBA_AVAILABLE and values.shape[1] >= _NUMBA_OUTLIER_MIN_COLUMNS:
+                                    # One parallel compiled pass per column for wide frames
+                                    counts = _iqr_outlier_counts(np.asfortranarray(values))
+                                else:
+                                    # Both quartiles for every column in one call, then one
+                                    # fused comparison over the whole matrix.
+                                    Q1, Q3 = numeric_df.quantile([0.25, 0.75]).to_numpy(dtype=np.float64)
+                                    IQR = Q3 - Q1
+                                    counts = ((values < Q1 - 1.5*IQR) | (values > Q3 + 1.5*IQR)).sum(axis=0)
+                                for col, outliers in zip(numeric_df.columns, counts.tolist()):
+                                    if outliers > 0:
+                                        insights.append(f"• {col}: {outliers} potential outliers detected")
                         
-                        # Correlation recommendations
-                        numeric_df = df.select_dtypes(include=[np.number])
-                        if len(numeric_df.columns) > 1:
-                            insights.append("• Perform correlation analysis to identify relationships")
-                            insights.append("• Consider feature selection for highly correlated variables")
+                        if focus in ["patterns", "all"]:
+                            insights.append(f"\n📈 Pattern Analysis:")
+                            # Find columns with high cardinality
+                            for col, n_unique in zip(df.columns, summary.nunique.tolist()):
+                                unique_ratio = n_unique / len(df)
+                                if unique_ratio > 0.95:
+                                    insights.append(f"• {col}: High uniqueness ({unique_ratio:.2%}) - potential identifier")
+                                elif unique_ratio < 0.05:
+                                    insights.append(f"• {col}: Low uniqueness ({unique_ratio:.2%}) - limited variability")
                         
-                        # Data type recommendations
-                        for col in df.columns:
-                            if df[col].dtype == 'object':
-                                try:
-                                    pd.to_numeric(df[col])
+                        if focus in ["recommendations", "all"]:
+                            insights.append(f"\n💡 Recommendations:")
+                        
+                            # Missing data recommendations
+                            missing_cols = df.columns[summary.null_counts > 0].tolist()
+                            if missing_cols:
+                                insights.append(f"• Address missing data in: {', '.join(missing_cols)}")
+                        
+                            # Correlation recommendations
+                            if len(summary.numeric_cols) > 1:
+                                insights.append("• Perform correlation analysis to identify relationships")
+                                insights.append("• Consider feature selection for highly correlated variables")
+                        
+                            # Data type recommendations: reject on a head sample before
+                            # parsing the full column
+                            for col in df.select_dtypes(include='object').columns:
+                                series = df[col]
+                                if not _numeric_convertible(series.head(_NUMERIC_PROBE_ROWS)):
+                                    continue
+                                if len(series) <= _NUMERIC_PROBE_ROWS or _numeric_convertible(series):
                                     insights.append(f"• Consider converting '{col}' to numeric type")
-                                except:
-                                    pass
+                        
+                        summary.insights[focus] = insights
                     
-                    self.analysis_history.append({
+                    self._record_history({
                         "action": "generate_insights",
                         "dataset": dataset_name,
                         "focus": focus,
                         "timestamp": datetime.now().isoformat()
                     })
                     
-                    return [types.TextContent(
-                        type="text",
-                        text=f"Data Insights for '{dataset_name}':\n\n" + "\n".join(insights)
-                    )]
+                    return _text(f"Data Insights for '{dataset_name}':\n\n" + "\n".join(insights))
                 
                 elif name == "export_analysis":
                     dataset_name = arguments["name"]
@@ -465,9 +1036,11 @@ class DataAnalysisMCPServer:
                     output_path = arguments["output_path"]
                     
                     if dataset_name not in self.datasets:
-                        return [types.TextContent(type="text", text=f"Dataset '{dataset_name}' not found.")]
+                        return _text(f"Dataset '{dataset_name}' not found.")
                     
                     df = self.datasets[dataset_name]
+                    summary = self._summary(dataset_name)
+                    has_numeric = len(summary.numeric_cols) > 0
                     
                     # Create output directory if it doesn't exist
                     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
@@ -478,15 +1051,15 @@ class DataAnalysisMCPServer:
                         analysis_report = {
                             "dataset_name": dataset_name,
                             "shape": df.shape,
-                            "columns": list(df.columns),
-                            "dtypes": df.dtypes.astype(str).to_dict(),
-                            "statistics": df.describe().to_dict() if len(df.select_dtypes(include=[np.number]).columns) > 0 else {},
-                            "missing_data": df.isnull().sum().to_dict(),
-                            "sample_data": df.head().to_dict(orient='records'),
+                            "columns": df.columns.tolist(),
+                            "dtypes": summary.dtypes_str,
+                            "statistics": summary.describe_dict if has_numeric else {},
+                            "missing_data": summary.null_counts_dict,
+                            "sample_data": _fast_head_records(df, 5),
                             "export_timestamp": datetime.now().isoformat()
                         }
                         with open(output_path, 'w') as f:
-                            json.dump(analysis_report, f, indent=2, default=str)
+                            f.write(_dumps(analysis_report))
                     elif format_type == "html":
                         html_content = f"""
                         <!DOCTYPE html>
@@ -499,7 +1072,7 @@ class DataAnalysisMCPServer:
                         <h2>Sample Data</h2>
                         {df.head(10).to_html()}
                         <h2>Statistics</h2>
-                        {df.describe().to_html() if len(df.select_dtypes(include=[np.number]).columns) > 0 else '<p>No numeric columns for statistics</p>'}
+                        {summary.describe.to_html() if has_numeric else '<p>No numeric columns for statistics</p>'}
                         </body>
                         </html>
                         """
@@ -507,10 +1080,7 @@ class DataAnalysisMCPServer:
                             f.write(html_content)
                     
                     logger.info(f"Exported analysis for '{dataset_name}' to {output_path}")
-                    return [types.TextContent(
-                        type="text",
-                        text=f"Successfully exported '{dataset_name}' analysis to {output_path} ({format_type} format)"
-                    )]
+                    return _text(f"Successfully exported '{dataset_name}' analysis to {output_path} ({format_type} format)")
                 
                 elif name == "filter_data":
                     dataset_name = arguments["name"]
@@ -518,33 +1088,33 @@ class DataAnalysisMCPServer:
                     new_name = arguments["new_name"]
                     
                     if dataset_name not in self.datasets:
-                        return [types.TextContent(type="text", text=f"Dataset '{dataset_name}' not found.")]
+                        return _text(f"Dataset '{dataset_name}' not found.")
                     
-                    df = self.datasets[dataset_name].copy()
-                    original_shape = df.shape
+                    source = self.datasets[dataset_name]
+                    original_shape = source.shape
                     
-                    # Apply filters (simplified implementation)
+                    # Combine every condition into one mask and index the frame once
+                    # (simplified implementation)
+                    mask = None
                     for condition in conditions:
                         if "column" in condition and "operator" in condition and "value" in condition:
                             col = condition["column"]
-                            op = condition["operator"]
-                            val = condition["value"]
+                            compare = self._OP_TABLE.get(condition["operator"])
                             
-                            if col in df.columns:
-                                if op == "==":
-                                    df = df[df[col] == val]
-                                elif op == "!=":
-                                    df = df[df[col] != val]
-                                elif op == ">":
-                                    df = df[df[col] > val]
-                                elif op == "<":
-                                    df = df[df[col] < val]
-                                elif op == ">=":
-                                    df = df[df[col] >= val]
-                                elif op == "<=":
-                                    df = df[df[col] <= val]
-                    
-                    self.datasets[new_name] = df
+                            if col in source.columns and compare is not None:
+                                column = source[col]
+                                # Plain numeric columns compare on the raw array; object,
+                                # datetime and nullable columns keep pandas' semantics
+                                if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biuf":
+                                    column = column.to_numpy()
+                                matches = compare(column, condition["value"])
+                                mask = matches if mask is None else mask & matches
+                    
+                    # Stored frames are never modified in place, so with no
+                    # applicable conditions the source can be shared as-is
+                    df = source if mask is None else source[mask]
+                    
+                    self._set_dataset(new_name, df)
                     
                     result = f"Filtered dataset '{dataset_name}' → '{new_name}'\n"
                     result += f"Original shape: {original_shape}\n"
@@ -552,136 +1122,33 @@ class DataAnalysisMCPServer:
                     result += f"Filters applied: {len(conditions)}"
                     
                     logger.info(f"Created filtered dataset '{new_name}' from '{dataset_name}'")
-                    return [types.TextContent(type="text", text=result)]
+                    return _text(result)
                 
                 else:
-                    return [types.TextContent(type="text", text=f"Unknown tool: {name}")]
+                    return _text(f"Unknown tool: {name}")
                     
             except Exception as e:
                 logger.error(f"Error executing tool '{name}': {str(e)}", exc_info=True)
-                return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+                return _text(f"Error: {str(e)}")
         
         @self.server.list_resources()
         async def handle_list_resources() -> List[types.Resource]:
             """List available resources."""
-            resources = [
-                types.Resource(
-                    uri=AnyUrl("data://loaded_datasets"),
-                    name="Loaded Datasets",
-                    description="Information about currently loaded datasets",
-                    mimeType="application/json"
-                ),
-                types.Resource(
-                    uri=AnyUrl("data://analysis_guide"),
-                    name="Data Analysis Guide",
-                    description="Guide for performing data analysis with this server",
-                    mimeType="text/plain"
-                ),
-                types.Resource(
-                    uri=AnyUrl("data://analysis_history"),
-                    name="Analysis History",
-                    description="History of analysis operations performed",
-                    mimeType="application/json"
-                )
-            ]
-            
-            # Add resources for each loaded dataset
-            for dataset_name in self.datasets.keys():
-                resources.append(
-                    types.Resource(
-                        uri=AnyUrl(f"data://dataset/{dataset_name}"),
-                        name=f"Dataset: {dataset_name}",
-                        description=f"Detailed information about {dataset_name} dataset",
-                        mimeType="application/json"
-                    )
-                )
-            
-            return resources
+            return list(self._resource_cache)
         
         @self.server.read_resource()
-        async def handle_read_resource(uri: AnyUrl) -> str:
+        async def handle_read_resource(uri: AnyUrl) -> Union[str, bytes]:
             """Handle resource reading."""
             uri_str = str(uri)
             
-            if uri_str == "data://loaded_datasets":
-                dataset_info = {}
-                for name, df in self.datasets.items():
-                    dataset_info[name] = {
-                        "shape": df.shape,
-                        "columns": list(df.columns),
-                        "dtypes": df.dtypes.astype(str).to_dict(),
-                        "memory_usage_mb": df.memory_usage(deep=True).sum() / (1024 * 1024)
-                    }
-                return json.dumps(dataset_info, indent=2, default=str)
-            
-            elif uri_str == "data://analysis_guide":
-                guide = """
-# Data Analysis MCP Server Guide
-
-This server provides comprehensive data analysis capabilities for data analysts.
-
-## Workflow:
-
-1. **Load Dataset**: Use `load_dataset` to load CSV or JSON files
-2. **Explore Data**: Use `dataset_info` to understand your data structure
-3. **Quality Check**: Run `data_quality_check` to identify issues
-4. **Statistical Analysis**: Use `calculate_statistics` for descriptive stats
-5. **Find Relationships**: Use `find_correlations` to discover patterns
-6. **Group Analysis**: Use `group_analysis` for segmentation
-7. **Get Insights**: Use `generate_insights` for automated recommendations
-
-## Example Workflow:
-
-```
-1. load_dataset(path="data/sales.csv", name="sales")
-2. dataset_info(name="sales")
-3. data_quality_check(name="sales")
-4. calculate_statistics(name="sales")
-5. find_correlations(name="sales", threshold=0.5)
-6. group_analysis(name="sales", group_by="region")
-7. generate_insights(name="sales", focus="recommendations")
-```
-
-## Tips for Data Analysts:
-
-- Always start with data quality checks
-- Use correlation analysis to identify multicollinearity
-- Group analysis is perfect for segmentation studies
-- Automated insights help identify patterns you might miss
-- Clean your data before statistical analysis
-
-## Supported Formats:
-- CSV files (with custom delimiters)
-- JSON files
-- Pandas-compatible formats
-
-## Statistical Methods:
-- Descriptive statistics (mean, median, std, etc.)
-- Correlation analysis (Pearson, Spearman, Kendall)
-- Outlier detection (IQR method)
-- Missing data analysis
-- Unique value analysis
-"""
-                return guide.strip()
-            
-            elif uri_str == "data://analysis_history":
-                return json.dumps(self.analysis_history, indent=2, default=str)
+            reader = self._resource_handlers.get(uri_str)
+            if reader is not None:
+                return reader()
             
             elif uri_str.startswith("data://dataset/"):
                 dataset_name = uri_str.split("/")[-1]
                 if dataset_name in self.datasets:
-                    df = self.datasets[dataset_name]
-                    info = {
-                        "name": dataset_name,
-                        "shape": df.shape,
-                        "columns": list(df.columns),
-                        "dtypes": df.dtypes.astype(str).to_dict(),
-                        "sample_data": df.head(10).to_dict(orient='records'),
-                        "summary_statistics": df.describe().to_dict() if len(df.select_dtypes(include=[np.number]).columns) > 0 else {},
-                        "missing_data": df.isnull().sum().to_dict(),
-                        "unique_counts": df.nunique().to_dict()
-                    }
-                    return json.dumps(info, indent=2, default=str)
+                    return self._summary(dataset_name).resource_json
                 else:
                     raise ValueError(f"Dataset '{dataset_name}' not found")
             
@@ -715,6 +1182,10 @@ def main():
     logger.info("Data analysis tools ready for use!")
     print("Data analysis tools ready for use!", file=sys.stderr)
     
+    if UVLOOP_AVAILABLE:
+        # libuv-based loop: cheaper stdio reads and writes per request
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
     try:
         server = DataAnalysisMCPServer()
         asyncio.run(server.run())
@@ -0,0 +1,97 @@
+"""
+Server startup probe shared by the test scripts.
+
+Starts server scripts as real processes and waits for each one's startup
+banner on stderr instead of sleeping for a fixed time.
+"""
+
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+# (label, script, stderr line printed once the server is up)
+SERVERS = [
+    ("Basic Server", "src/mcp_servers/basic_server.py", "Starting Basic MCP Server"),
+    ("Advanced Server", "src/mcp_servers/advanced_server.py", "Starting Advanced MCP Server"),
+    ("Data Analysis Server", "src/mcp_servers/data_analysis_server.py", "Data analysis tools ready for use!")
+]
+
+STARTUP_TIMEOUT = 5.0
+
+# The banners are printed before each server builds its Server object and
+# enters run(), so a server must also stay up this long after its banner.
+READY_GRACE = 1.0
+
+
+def start_server(server_script):
+    """Start a server process without waiting for it."""
+    return subprocess.Popen(
+        # Unbuffered so the startup banner reaches the pipe immediately
+        [sys.executable, "-u", server_script],
+        # An open, silent stdin keeps the stdio transport waiting for a client
+        # rather than exiting on EOF
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+
+
+def wait_until_ready(process, ready_token, deadline, grace=READY_GRACE):
+    """Read a server's stderr until its startup banner appears, then make sure it stays up.
+
+    Returns (ready, stderr lines seen). Not ready if the banner does not
+    appear before the deadline (a time.monotonic() value), or if the process
+    exits before grace seconds have passed after it. Pipes cannot be
+    polled with select() on Windows, so a background thread reads stderr
+    and keeps draining it afterwards so the server never blocks on a full pipe.
+    """
+    lines = queue.Queue()
+
+    def pump():
+        for line in process.stderr:
+            lines.put(line)
+        lines.put(None)
+
+    threading.Thread(target=pump, daemon=True).start()
+
+    seen = []
+    banner_seen = False
+    while True:
+        try:
+            line = lines.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            # Still running at the deadline: ready only if the banner came
+            return banner_seen and process.poll() is None, seen
+        if line is None:
+            # stderr closed: the server exited, whether or not it printed its banner
+            return False, seen
+        seen.append(line)
+        if not banner_seen and ready_token in line:
+            banner_seen = True
+            # Construction and stdio setup happen after the banner; keep
+            # watching for a crash until the grace period ends
+            deadline = time.monotonic() + grace
+
+
+def probe_servers(servers=SERVERS, timeout=STARTUP_TIMEOUT):
+    """Start every server at once and report whether each came up.
+
+    Returns one (ready, stderr lines seen) pair per entry of servers, in
+    order. All processes are stopped before returning.
+    """
+    processes = [start_server(server_script) for _, server_script, _ in servers]
+    try:
+        deadline = time.monotonic() + timeout
+        return [
+            wait_until_ready(process, ready_token, deadline)
+            for process, (_, _, ready_token) in zip(processes, servers)
+        ]
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+            process.stdin.close()
@@ -5,18 +5,24 @@ Tests new features, error handling, logging, and data analysis capabilities.
 """
 
 import asyncio
+import base64
+import importlib
 import json
 import logging
+import logging.handlers
+import math
 import os
+import queue
+import re
 import sys
-import subprocess
 import tempfile
-import time
 import unittest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from io import StringIO
 
+from _startup_probe import SERVERS, probe_servers
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -100,6 +106,276 @@ class TestDataAnalysisFeatures(unittest.TestCase):
         self.assertIsNotNone(grouped)
         self.assertGreater(len(grouped), 0)
 
+class TestFastPathEquivalence(unittest.TestCase):
+    """Test that the optional fast paths give the same results as pandas."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+    
+    def _server_module(self, name, *packages):
+        """Import a server module, skipping when it or an optional package is missing."""
+        for package in ("pandas",) + packages:
+            try:
+                importlib.import_module(package)
+            except ImportError:
+                self.skipTest(f"{package} not available")
+        try:
+            return importlib.import_module(f"src.mcp_servers.{name}")
+        except ImportError:
+            self.skipTest("mcp not available")
+    
+    def _write_csv(self, text, name="data.csv"):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+    
+    def _mixed_csv(self):
+        """CSV with missing values, pandas NA strings and a column that turns float late."""
+        lines = ["id,price,label,late"]
+        for i in range(200):
+            price = "NA" if i % 17 == 0 else "" if i % 23 == 0 else str(i * 1.5)
+            label = ["a", "b", "None"][i % 3]
+            late = str(i) if i < 150 else str(i + 0.5)
+            lines.append(f"{i},{price},{label},{late}")
+        return self._write_csv("\n".join(lines) + "\n")
+    
+    def _assert_same_report(self, fast, slow):
+        """Compare a fast csv_analyze report with the pandas one."""
+        self.assertEqual(tuple(fast["shape"]), tuple(slow["shape"]))
+        self.assertEqual(list(fast["columns"]), list(slow["columns"]))
+        self.assertEqual({c: str(t) for c, t in fast["dtypes"].items()},
+                         {c: str(t) for c, t in slow["dtypes"].items()})
+        self.assertEqual({c: int(n) for c, n in fast["null_counts"].items()},
+                         {c: int(n) for c, n in slow["null_counts"].items()})
+        self.assertEqual(set(fast["basic_stats"]), set(slow["basic_stats"]))
+        for col, stats in slow["basic_stats"].items():
+            for stat, expected in stats.items():
+                actual = fast["basic_stats"][col][stat]
+                if math.isnan(expected):
+                    self.assertTrue(actual is None or math.isnan(actual), f"{col} {stat}")
+                else:
+                    self.assertAlmostEqual(actual, expected, places=6, msg=f"{col} {stat}")
+    
+    def test_polars_csv_analysis_matches_pandas(self):
+        """The polars csv_analyze report matches the pandas one."""
+        server = self._server_module("advanced_server", "polars")
+        path = self._mixed_csv()
+        
+        self._assert_same_report(server._csv_analysis_polars(path, ","),
+                                 server._csv_analysis_pandas(path, ","))
+        
+        # Text-only files keep pandas' text summary
+        text_path = self._write_csv("name,city\nAnn,Oslo\nBo,Rome\n", "text.csv")
+        self.assertIsNone(server._csv_analysis_polars(text_path, ","))
+        self.assertEqual(server._csv_analysis(text_path, ",")["basic_stats"],
+                         server._csv_analysis_pandas(text_path, ",")["basic_stats"])
+    
+    def test_arrow_csv_analysis_matches_pandas(self):
+        """The pyarrow csv_analyze report matches the pandas one, with a pandas fallback."""
+        server = self._server_module("advanced_server", "pyarrow")
+        path = self._mixed_csv()
+        expected = server._csv_analysis_pandas(path, ",")
+        
+        self._assert_same_report(server._csv_analysis_arrow(path, ","), expected)
+        
+        text_path = self._write_csv("name,city\nAnn,Oslo\nBo,Rome\n", "text.csv")
+        self.assertIsNone(server._csv_analysis_arrow(text_path, ","))
+        
+        # A type pyarrow rejects after its first block falls back to pandas
+        with patch.object(server, "POLARS_AVAILABLE", False), \
+                patch.object(server, "_csv_analysis_arrow", side_effect=server.pa.ArrowInvalid("late type")):
+            self._assert_same_report(server._csv_analysis(path, ","), expected)
+    
+    def test_chunked_csv_analysis_matches_pandas(self):
+        """Streaming a CSV in chunks reports the same schema and stats as one full read."""
+        server = self._server_module("advanced_server")
+        # qty is int64 in the first chunk and gains a missing value in the third;
+        # flag is bool until a missing value turns it object
+        lines = ["qty,flag,price"]
+        for i in range(250):
+            qty = "" if i == 120 else str(i)
+            flag = "" if i == 220 else ["True", "False"][i % 2]
+            lines.append(f"{qty},{flag},{i * 0.5}")
+        path = self._write_csv("\n".join(lines) + "\n")
+        
+        with patch.object(server, "_CSV_CHUNK_ROWS", 50):
+            chunked = server._csv_analysis_chunked(path, ",")
+        full = server._csv_analysis_pandas(path, ",")
+        
+        self.assertEqual(tuple(chunked["shape"]), tuple(full["shape"]))
+        self.assertEqual({c: str(t) for c, t in chunked["dtypes"].items()},
+                         {c: str(t) for c, t in full["dtypes"].items()})
+        self.assertEqual(str(chunked["dtypes"]["qty"]), "float64")
+        self.assertEqual({c: int(n) for c, n in chunked["null_counts"].items()},
+                         {c: int(n) for c, n in full["null_counts"].items()})
+        self.assertEqual(set(chunked["basic_stats"]), set(full["basic_stats"]))
+        for col, stats in chunked["basic_stats"].items():
+            for stat, actual in stats.items():
+                self.assertAlmostEqual(actual, full["basic_stats"][col][stat], places=6, msg=f"{col} {stat}")
+    
+    def test_numeric_convertible_matches_to_numeric(self):
+        """The numeric-conversion probe accepts exactly what pd.to_numeric accepts."""
+        server = self._server_module("data_analysis_server")
+        pd = server.pd
+        
+        def to_numeric_accepts(values):
+            try:
+                pd.to_numeric(pd.Series(values, dtype=object))
+            except (TypeError, ValueError):
+                return False
+            return True
+        
+        cases = [
+            (["1", "2.5", None], True),
+            (["1", "nan", "NaN"], True),
+            ([1, "2", 3.5], True),
+            (["inf", "-1e3", float("nan")], True),
+            (["1", "x"], False),
+            (["nan", "x"], False),
+            ([[1], 2], False),
+            ([{"a": 1}], False)
+        ]
+        for values, expected in cases:
+            series = pd.Series(values, dtype=object)
+            self.assertEqual(server._numeric_convertible(series), expected, values)
+            self.assertEqual(to_numeric_accepts(values), expected, values)
+    
+    def test_pyarrow_engine_load_matches_c_engine(self):
+        """Datasets loaded through the pyarrow engine match the default engine."""
+        server = self._server_module("data_analysis_server", "pyarrow")
+        pd = server.pd
+        
+        # ISO dates stay text, as the C engine leaves them
+        dated = self._write_csv("day,amount\n2024-01-01,1.5\n2024-01-02,\n2024-01-03,3\n", "dated.csv")
+        plain = self._write_csv("a,b\n1,x\n2,\n3,z\n", "plain.csv")
+        for path in (dated, plain):
+            pd.testing.assert_frame_equal(server._parse_csv(path, ","), pd.read_csv(path))
+    
+    def test_parquet_cache_matches_csv(self):
+        """Cached loads match a fresh parse, and editing the CSV invalidates the cache."""
+        server = self._server_module("data_analysis_server", "pyarrow")
+        pd = server.pd
+        path = self._write_csv("a,b\n1,x\n2,\n3,z\n")
+        cache_dir = Path(self.temp_dir) / "cache"
+        
+        with patch.object(server, "_PARQUET_CACHE_MIN_BYTES", 0), \
+                patch.object(server, "_PARQUET_CACHE_DIR", cache_dir):
+            # Miss: parsed and written to the cache
+            pd.testing.assert_frame_equal(server._read_csv(path, ","), pd.read_csv(path))
+            self.assertEqual(len(list(cache_dir.glob("*.parquet"))), 1)
+            
+            # Hit: served from the cache without parsing
+            with patch.object(server, "_parse_csv", side_effect=AssertionError("CSV parsed again")):
+                pd.testing.assert_frame_equal(server._read_csv(path, ","), pd.read_csv(path))
+            
+            # Invalidation: an edited CSV is parsed again and replaces its stale copy
+            self._write_csv("a,b\n4,y\n5,w\n")
+            mtime_ns = os.stat(path).st_mtime_ns + 10 ** 9
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+            pd.testing.assert_frame_equal(server._read_csv(path, ","), pd.read_csv(path))
+            self.assertEqual(len(list(cache_dir.glob("*.parquet"))), 1)
+            self.assertEqual(list(cache_dir.glob("*.tmp")), [])
+    
+    def test_orjson_dumps_matches_json(self):
+        """orjson and the json fallback encode to the same JSON values."""
+        serialization = self._server_module("_serialization", "numpy", "orjson")
+        import numpy as np
+        import pandas as pd
+        from datetime import date, datetime
+        
+        report = {
+            "count": np.int64(5),
+            "mean": np.float64(2.5),
+            "missing": np.float64("nan"),
+            "ratio": float("inf"),
+            "flag": np.bool_(True),
+            "values": np.array([1, 2]),
+            "when": datetime(2024, 1, 2, 3, 4, 5),
+            "day": date(2024, 1, 2),
+            "stamp": pd.Timestamp("2024-01-02 03:04:05"),
+            "np_when": np.datetime64("2024-01-02T03:04:05"),
+            "nested": [np.int32(1), {"x": np.float32(0.5)}]
+        }
+        expected = {
+            "count": 5, "mean": 2.5, "missing": None, "ratio": None, "flag": True,
+            "values": [1, 2], "when": "2024-01-02T03:04:05", "day": "2024-01-02",
+            "stamp": "2024-01-02T03:04:05", "np_when": "2024-01-02T03:04:05",
+            "nested": [1, {"x": 0.5}]
+        }
+        
+        fast = json.loads(serialization.dumps(report))
+        with patch.object(serialization, "ORJSON_AVAILABLE", False):
+            slow = json.loads(serialization.dumps(report))
+        self.assertEqual(fast, expected)
+        self.assertEqual(slow, expected)
+        self.assertIsInstance(slow["count"], int)
+    
+    def test_dataset_reports_match_across_encoders(self):
+        """dataset_info and data_quality_check decode the same with or without orjson."""
+        server_module = self._server_module("data_analysis_server", "orjson")
+        import mcp.types as types
+        from src.mcp_servers import _serialization
+        
+        server = server_module.DataAnalysisMCPServer()
+        server._set_dataset("sales", server_module.pd.DataFrame({
+            "units": [1, 2, None],
+            "region": ["a", "b", "b"]
+        }))
+        handler = server.server.request_handlers[types.CallToolRequest]
+        
+        def reports():
+            decoded = {}
+            for tool in ("dataset_info", "data_quality_check"):
+                server._summary_cache.clear()
+                request = types.CallToolRequest(
+                    method="tools/call",
+                    params=types.CallToolRequestParams(name=tool, arguments={"name": "sales"})
+                )
+                text = asyncio.run(handler(request)).root.content[0].text
+                decoded[tool] = json.loads(text.split("\n", 1)[1])
+            return decoded
+        
+        fast = reports()
+        with patch.object(_serialization, "ORJSON_AVAILABLE", False):
+            slow = reports()
+        self.assertEqual(fast, slow)
+        total_missing = slow["data_quality_check"]["missing_data"]["total_missing_values"]
+        self.assertIsInstance(total_missing, int)
+        self.assertEqual(total_missing, 1)
+        self.assertEqual(slow["dataset_info"]["columns"]["null_counts"], {"units": 1, "region": 0})
+
+
+class TestResourceReading(unittest.TestCase):
+    """Test reading server resources the way the example client does."""
+    
+    def test_gzip_guide_resource(self):
+        """The gzip guide resource decodes to the plain-text guide."""
+        try:
+            import mcp.types as types
+            from src.mcp_servers import data_analysis_server
+        except ImportError:
+            self.skipTest("mcp not available")
+        from src.clients.client_example import resource_text
+        
+        server = data_analysis_server.DataAnalysisMCPServer()
+        blob = server._resource_handlers["data://analysis_guide.gz"]()
+        self.assertIsInstance(blob, bytes)
+        
+        # Encoded as the mcp 1.0 server sends a bytes resource
+        contents = types.BlobResourceContents(
+            uri="data://analysis_guide.gz",
+            mimeType="application/gzip",
+            blob=base64.urlsafe_b64encode(blob).decode()
+        )
+        self.assertEqual(resource_text(contents), server._resource_handlers["data://analysis_guide"]())
+        
+        text = types.TextResourceContents(uri="data://analysis_guide", text="guide")
+        self.assertEqual(resource_text(text), "guide")
+
 class TestExportFunctionality(unittest.TestCase):
     """Test data export capabilities."""
     
@@ -206,6 +482,10 @@ class TestExportFunctionality(unittest.TestCase):
             self.assertIn('<table', content)
             self.assertIn('Product', content)
 
+# Keywords that mark an expression as unsafe, matched in a single pass
+_UNSAFE_RE = re.compile("|".join(map(re.escape, ["import", "exec", "eval", "__", "open"])))
+
+
 class TestErrorHandling(unittest.TestCase):
     """Test error handling scenarios."""
     
@@ -231,11 +511,68 @@ class TestErrorHandling(unittest.TestCase):
             "open('/etc/passwd')"
         ]
         
-        dangerous_keywords = ["import", "exec", "eval", "__", "open"]
-        
         for expr in unsafe_expressions:
-            has_dangerous = any(keyword in expr for keyword in dangerous_keywords)
-            self.assertTrue(has_dangerous, f"Expression '{expr}' should be detected as unsafe")
+            self.assertTrue(_UNSAFE_RE.search(expr), f"Expression '{expr}' should be detected as unsafe")
+    
+    def test_calculator_allowlist(self):
+        """The calculator evaluates arithmetic and rejects other syntax and runaway operands."""
+        try:
+            from src.mcp_servers import basic_server
+        except ImportError:
+            self.skipTest("mcp not available")
+        
+        def calculate(expression):
+            code = basic_server._compile_expression(expression)
+            return eval(code, {"__builtins__": {}}, basic_server._CALCULATOR_SCOPE)
+        
+        self.assertEqual(calculate("2 + 3 * 4"), 14)
+        self.assertEqual(calculate("2 ** 10"), 1024)
+        self.assertEqual(calculate("1 << 5"), 32)
+        self.assertEqual(calculate("max(abs(-3), pow(2, 3), round(2.5))"), 8)
+        self.assertEqual(calculate("pow(2, 10 ** 9, 7)"), 2)
+        
+        rejected = [
+            "__import__('os')",
+            "(1).real",
+            "'a' * 3",
+            "lambda: 1",
+            "_bounded_pow(2, 3)",
+            "9 ** 9 ** 9",
+            "pow(9, 9 ** 9)",
+            "1 << 10 ** 9",
+            "[1] * 10 ** 10",
+            "max([[1], [2]]) * 10 ** 10",
+            "round(1, -10 ** 9)"
+        ]
+        for expr in rejected:
+            with self.assertRaises(ValueError, msg=expr):
+                calculate(expr)
+    
+    def test_file_read_max_chars(self):
+        """file_read only reports truncation when max_chars actually cut the file."""
+        try:
+            from src.mcp_servers import advanced_server
+        except ImportError:
+            self.skipTest("mcp not available")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "five.txt")
+            with open(path, 'w') as f:
+                f.write("abcde")
+            
+            exact = advanced_server._file_read_reply(path, "utf-8", 5)
+            self.assertNotIn("limited by max_chars", exact)
+            self.assertTrue(exact.endswith("\nabcde"))
+            
+            cut = advanced_server._file_read_reply(path, "utf-8", 4)
+            self.assertIn("4 characters (limited by max_chars", cut)
+            self.assertTrue(cut.endswith("\nabcd"))
+        
+        self.assertIsNone(advanced_server._max_chars_argument({}))
+        self.assertEqual(advanced_server._max_chars_argument({"max_chars": 1}), 1)
+        for invalid in (0, -1, True, "10"):
+            with self.assertRaises(ValueError, msg=repr(invalid)):
+                advanced_server._max_chars_argument({"max_chars": invalid})
     
     def test_file_not_found_handling(self):
         """Test handling of non-existent files."""
@@ -309,17 +646,22 @@ class TestLoggingFunctionality(unittest.TestCase):
             # Clear existing handlers
             logger.handlers.clear()
             
-            # Add file handler
+            # Queue-backed file logging, as the data analysis server uses
             file_handler = logging.FileHandler(log_file)
             formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            log_queue = queue.Queue(-1)
+            listener = logging.handlers.QueueListener(log_queue, file_handler)
+            listener.start()
+            logger.addHandler(logging.handlers.QueueHandler(log_queue))
             
             # Log some messages
             logger.info("Test file logging")
             logger.warning("Test warning to file")
             
-            # Ensure data is written
+            # Ensure queued records are written
+            listener.stop()
+            logger.handlers.clear()
             file_handler.close()
             
             # Verify file was created and has content
@@ -334,42 +676,44 @@ class TestLoggingFunctionality(unittest.TestCase):
 class TestMCPServerIntegration(unittest.TestCase):
     """Test MCP server integration and functionality."""
     
+    # Server module -> server class it defines
+    SERVER_CLASSES = {
+        "src.mcp_servers.basic_server": "BasicMCPServer",
+        "src.mcp_servers.advanced_server": "AdvancedMCPServer",
+        "src.mcp_servers.data_analysis_server": "DataAnalysisMCPServer"
+    }
+    
+    def test_server_construction(self):
+        """Test that each server module imports and builds its server in-process."""
+        for module_name, class_name in self.SERVER_CLASSES.items():
+            with self.subTest(server=module_name):
+                module = importlib.import_module(module_name)
+                
+                self.assertTrue(hasattr(module, class_name))
+                server = getattr(module, class_name)()
+                self.assertIsNotNone(server.server)
+
+
+@unittest.skipUnless(os.environ.get("MCP_SLOW_TESTS") == "1",
+                     "set MCP_SLOW_TESTS=1 to start real server processes")
+class TestMCPServerProcesses(unittest.TestCase):
+    """Smoke test that each server starts as a real process."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Start every server at once and wait for each startup banner."""
+        cls.startup = dict(zip((script for _, script, _ in SERVERS), probe_servers()))
+    
     def test_server_process_startup(self):
         """Test that servers can start without immediate errors."""
-        servers = [
-            "src/mcp_servers/basic_server.py",
-            "src/mcp_servers/advanced_server.py",
-            "src/mcp_servers/data_analysis_server.py"
-        ]
-        
-        for server_script in servers:
-            if not os.path.exists(server_script):
-                self.fail(f"Server script not found: {server_script}")
-                continue
-            
-            try:
-                # Start server process
-                process = subprocess.Popen(
-                    [sys.executable, server_script],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                
-                # Wait briefly to see if it starts
-                time.sleep(2)
+        for _, server_script, _ in SERVERS:
+            with self.subTest(server=server_script):
+                if not os.path.exists(server_script):
+                    self.fail(f"Server script not found: {server_script}")
                 
-                # Check if process is still running
-                if process.poll() is None:
-                    # Server started successfully
-                    process.terminate()
-                    process.wait()
-                else:
-                    stdout, stderr = process.communicate()
-                    self.fail(f"Server {server_script} failed to start. stderr: {stderr}")
-                    
-            except Exception as e:
-                self.fail(f"Error testing server {server_script}: {e}")
+                ready, stderr = self.startup[server_script]
+                if not ready:
+                    self.fail(f"Server {server_script} failed to start. stderr: {''.join(stderr)}")
 
 
 def run_comprehensive_tests():
@@ -384,10 +728,13 @@ def run_comprehensive_tests():
     # Add test classes
     test_classes = [
         TestDataAnalysisFeatures,
+        TestFastPathEquivalence,
+        TestResourceReading,
         TestExportFunctionality,
         TestErrorHandling,
         TestLoggingFunctionality,
-        TestMCPServerIntegration
+        TestMCPServerIntegration,
+        TestMCPServerProcesses
     ]
     
     for test_class in test_classes:
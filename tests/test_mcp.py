@@ -9,10 +9,10 @@ import csv
 import json
 import os
 import sys
-import subprocess
-import time
 from pathlib import Path
 
+from _startup_probe import SERVERS, probe_servers
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -64,38 +64,19 @@ def test_file_structure():
     
     return all_exist
 
-def test_server_startup(server_script, timeout=5):
-    """Test that a server can start without errors."""
-    print(f"\nTesting {server_script} startup...")
-    
-    try:
-        # Start server process
-        process = subprocess.Popen(
-            [sys.executable, server_script],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        # Wait briefly to see if it starts without immediate errors
-        time.sleep(2)
-        
-        # Check if process is still running
-        if process.poll() is None:
+def check_server_startup():
+    """Start every server at once and report which ones came up."""
+    print("\nStarting servers...")
+    results = []
+    for (label, server_script, _), (ready, stderr) in zip(SERVERS, probe_servers()):
+        if ready:
             print(f"+ {server_script} started successfully")
-            process.terminate()
-            process.wait()
-            return True
         else:
-            stdout, stderr = process.communicate()
             print(f"- {server_script} failed to start")
             if stderr:
-                print(f"  Error: {stderr}")
-            return False
-            
-    except Exception as e:
-        print(f"- Error testing {server_script}: {e}")
-        return False
+                print(f"  Error: {''.join(stderr)}")
+        results.append((f"{label} Startup", ready))
+    return results
 
 def test_sample_data():
     """Test that sample data is valid."""
@@ -178,10 +159,7 @@ def main():
     tests = [
         ("Import Test", test_imports),
         ("File Structure Test", test_file_structure),
-        ("Sample Data Test", test_sample_data),
-        ("Basic Server Startup", lambda: test_server_startup("src/mcp_servers/basic_server.py")),
-        ("Advanced Server Startup", lambda: test_server_startup("src/mcp_servers/advanced_server.py")),
-        ("Data Analysis Server Startup", lambda: test_server_startup("src/mcp_servers/data_analysis_server.py"))
+        ("Sample Data Test", test_sample_data)
     ]
     
     results = []
@@ -194,6 +172,12 @@ def main():
             print(f"- {test_name} failed with exception: {e}")
             results.append((test_name, False))
     
+    try:
+        results.extend(check_server_startup())
+    except Exception as e:
+        print(f"- Server startup test failed with exception: {e}")
+        results.append(("Server Startup", False))
+    
     # Test client functionality
     try:
         client_result = asyncio.run(test_basic_client())